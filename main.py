@@ -14,6 +14,13 @@ sys.path.insert(0, str(project_root))
 from src.cli.main import main
 import asyncio
 
+# Use uvloop's faster event loop when it is installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 if __name__ == "__main__":
     # Run the CLI
     asyncio.run(main())
\ No newline at end of file
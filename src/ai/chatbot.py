@@ -6,22 +6,107 @@ for generating text completions and following instructions.
 """
 
 import os
+import asyncio
+import random
 import requests
+import httpx
 import json
+import orjson
 import logging
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# HTTP statuses worth retrying (rate limits and transient server errors)
+_RETRYABLE_STATUSES = {429, 500, 502, 503, 504, 529}
+_MAX_ATTEMPTS = 5
+_MAX_BACKOFF_SECONDS = 30.0
+
+# After retries are exhausted, short-circuit further requests for this long
+_CIRCUIT_COOLDOWN_SECONDS = 30.0
+_circuit_open_until = 0.0
+
+class RetryableHTTPError(Exception):
+    """
+    Raised when the Claude API keeps answering with a rate-limit or server error.
+    """
+    def __init__(self, status: Optional[int], message: str):
+        super().__init__(message)
+        self.status = status
+
+class CircuitOpenError(RetryableHTTPError):
+    """
+    Raised without contacting the API while the circuit breaker is open.
+    """
+
+class TruncatedResponseError(Exception):
+    """
+    Raised when Claude stopped at max_tokens, so the response is incomplete.
+    """
+    def __init__(self, text: str):
+        super().__init__(f"Response was truncated at max_tokens after {len(text)} characters")
+        self.text = text
+
+# Shared HTTP/2 client so concurrent requests multiplex over pooled connections
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    Get the shared httpx client, creating it on first use.
+    
+    Returns:
+        httpx.AsyncClient: The module-level client
+    """
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+            timeout=httpx.Timeout(60.0)
+        )
+    return _CLIENT
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """
+    Compute how long to wait before retrying a failed request.
+    
+    Args:
+        retry_after (str, optional): Value of the Retry-After response header
+        attempt (int): Zero-based attempt number
+        
+    Returns:
+        float: Delay in seconds
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), _MAX_BACKOFF_SECONDS)
+        except ValueError:
+            pass
+    
+    # Exponential backoff with jitter
+    return min(2 ** attempt + random.random(), _MAX_BACKOFF_SECONDS)
+
+async def close_session() -> None:
+    """
+    Close the shared httpx client if it is open.
+    """
+    global _CLIENT
+    if _CLIENT is not None and not _CLIENT.is_closed:
+        await _CLIENT.aclose()
+    _CLIENT = None
+
 class ChatBot:
     """
     A wrapper for the Claude API that provides a simple interface for generating 
     text completions and carrying on conversations.
     """
     
+    __slots__ = ("api_key", "model", "max_tokens", "system_prompt", "api_url",
+                 "conversation_history", "_headers")
+    
     def __init__(self, system_prompt: str, api_key: Optional[str] = None, 
                  model: str = "claude-3-7-sonnet-20250219", max_tokens: int = 4000):
         """
@@ -44,15 +129,17 @@ class ChatBot:
         self.system_prompt = system_prompt
         self.api_url = "https://api.anthropic.com/v1/messages"
         
-        # Initialize conversation history
-        self.conversation_history = []
+        # Request headers are the same for every call
+        self._headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01",
+            "anthropic-beta": "prompt-caching-2024-07-31"
+        }
         
-        # Add system prompt as the first message
-        if system_prompt:
-            self.conversation_history.append({
-                "role": "system",
-                "content": system_prompt
-            })
+        # Initialize conversation history (user and assistant turns only;
+        # the system prompt is sent separately in the request payload)
+        self.conversation_history = []
         
         logger.info(f"Initialized ChatBot with model: {model}")
     
@@ -89,7 +176,69 @@ class ChatBot:
         messages = self._prepare_messages()
         
         # Send request to Claude API
-        response_text = self._send_api_request(messages, stream)
+        try:
+            response_text = self._send_api_request(messages, stream)
+        except TruncatedResponseError as e:
+            # Keep the turns paired so the conversation can go on
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": e.text
+            })
+            raise
+        
+        # Add assistant response to conversation history
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": response_text
+        })
+        
+        return response_text
+    
+    async def asend_message(
+        self,
+        message: Union[str, List[Dict[str, Any]]],
+        keep_history: bool = True,
+        stream: bool = False
+    ) -> str:
+        """
+        Send a message to Claude without blocking the event loop.
+        
+        Args:
+            message (Union[str, List[Dict[str, Any]]]): The user message to send to Claude,
+                either plain text or a list of content blocks
+            keep_history (bool): Whether to record the exchange in the conversation history.
+                Pass False to send a one-off message, which is safe to do concurrently
+                on a shared ChatBot.
+            stream (bool): Whether to stream the response
+            
+        Returns:
+            str: Claude's response. A response cut off at max_tokens raises TruncatedResponseError
+            instead, carrying the partial text.
+        """
+        user_message = {
+            "role": "user",
+            "content": message
+        }
+        
+        if not keep_history:
+            return await self._asend_api_request(self._prepare_messages() + [user_message], stream)
+        
+        # Add user message to conversation history
+        self.conversation_history.append(user_message)
+        
+        # Prepare messages for the API
+        messages = self._prepare_messages()
+        
+        # Send request to Claude API
+        try:
+            response_text = await self._asend_api_request(messages, stream)
+        except TruncatedResponseError as e:
+            # Keep the turns paired so the conversation can go on
+            self.conversation_history.append({
+                "role": "assistant",
+                "content": e.text
+            })
+            raise
         
         # Add assistant response to conversation history
         self.conversation_history.append({
@@ -106,18 +255,7 @@ class ChatBot:
         Returns:
             List[Dict[str, str]]: List of message objects
         """
-        # Extract messages from conversation history
-        messages = []
-        system_message = None
-        
-        # Separate system message and other messages
-        for msg in self.conversation_history:
-            if msg["role"] == "system":
-                system_message = msg["content"]
-            else:
-                messages.append(msg)
-        
-        return messages
+        return self.conversation_history
     
     def _send_api_request(self, messages: List[Dict[str, str]], stream: bool = False) -> str:
         """
@@ -131,36 +269,14 @@ class ChatBot:
             str: Claude's response
         """
         try:
-            # Extract system prompt if it exists
-            system = None
-            if messages and messages[0]["role"] == "system":
-                system = messages[0]["content"]
-                messages = messages[1:]
-            
-            # Prepare request headers
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01"
-            }
-            
-            # Prepare request payload
-            payload = {
-                "model": self.model,
-                "max_tokens": self.max_tokens,
-                "stream": stream,
-                "messages": messages,
-            }
-            
-            # Add system prompt if available
-            if system:
-                payload["system"] = system
+            headers, payload = self._build_request(messages, stream)
             
             # Send request
             response = requests.post(
                 self.api_url,
                 headers=headers,
-                json=payload
+                json=payload,
+                stream=stream
             )
             
             # Check for errors
@@ -168,16 +284,17 @@ class ChatBot:
                 logger.error(f"API Error: {response.status_code} - {response.text}")
                 return f"API Error: {response.status_code} - {response.text}"
             
-            # Parse response
-            response_data = response.json()
+            if stream:
+                parts = []
+                truncated = False
+                for line in response.iter_lines(decode_unicode=True):
+                    truncated = self._handle_stream_line(line, parts) or truncated
+                return self._finish_stream(parts, truncated)
             
-            # Extract content
-            if "content" in response_data:
-                content = response_data["content"][0]["text"]
-                return content
-            else:
-                return response_data.get("completion", "No content received")
+            return self._extract_content(orjson.loads(response.content))
             
+        except TruncatedResponseError:
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error: {e}")
             return f"Request error: {e}"
@@ -188,22 +305,168 @@ class ChatBot:
             logger.error(f"Unexpected error: {e}")
             return f"Unexpected error: {e}"
     
-    def reset_conversation(self) -> None:
+    async def _asend_api_request(self, messages: List[Dict[str, str]], stream: bool = False) -> str:
         """
-        Reset the conversation history, keeping only the system prompt.
+        Send a request to the Claude API using the shared httpx client.
+        
+        Args:
+            messages (List[Dict[str, str]]): List of message objects
+            stream (bool): Whether to stream the response
+            
+        Returns:
+            str: Claude's response
         """
-        system_prompt = None
-        for msg in self.conversation_history:
-            if msg["role"] == "system":
-                system_prompt = msg["content"]
-                break
+        global _circuit_open_until
+        
+        # Fail fast while the API is known to be rejecting requests
+        remaining = _circuit_open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(None, f"Claude API circuit open, retry in {remaining:.1f}s")
+        
+        try:
+            headers, payload = self._build_request(messages, stream)
+            
+            for attempt in range(_MAX_ATTEMPTS):
+                async with _get_client().stream("POST", self.api_url, json=payload, headers=headers) as response:
+                    status = response.status_code
+                    if status == 200 and stream:
+                        # Accumulate text deltas as server-sent events arrive
+                        parts = []
+                        truncated = False
+                        async for line in response.aiter_lines():
+                            truncated = self._handle_stream_line(line, parts) or truncated
+                        return self._finish_stream(parts, truncated)
+                    
+                    body = await response.aread()
+                    if status == 200:
+                        response_data = orjson.loads(body)
+                        break
+                    
+                    text = body.decode("utf-8", errors="replace")
+                    retry_after = response.headers.get("Retry-After")
                 
-        self.conversation_history = []
+                # Back off and retry on rate limits and transient server errors
+                if status in _RETRYABLE_STATUSES and attempt < _MAX_ATTEMPTS - 1:
+                    delay = _retry_delay(retry_after, attempt)
+                    logger.warning(f"API returned {status}, retrying in {delay:.1f}s "
+                                   f"(attempt {attempt + 1}/{_MAX_ATTEMPTS})")
+                    await asyncio.sleep(delay)
+                    continue
+                
+                logger.error(f"API Error: {status} - {text}")
+                if status in _RETRYABLE_STATUSES:
+                    # Retries exhausted: open the circuit so other callers back off too
+                    _circuit_open_until = time.monotonic() + _CIRCUIT_COOLDOWN_SECONDS
+                    raise RetryableHTTPError(status, f"API Error: {status} - {text}")
+                return f"API Error: {status} - {text}"
+            
+            return self._extract_content(response_data)
+            
+        except (RetryableHTTPError, TruncatedResponseError):
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Request error: {e}")
+            return f"Request error: {e}"
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return f"JSON decode error: {e}"
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            return f"Unexpected error: {e}"
+    
+    def _build_request(self, messages: List[Dict[str, str]], stream: bool) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Build the headers and payload for a Claude API request.
         
-        if system_prompt:
-            self.conversation_history.append({
-                "role": "system",
-                "content": system_prompt
-            })
+        Args:
+            messages (List[Dict[str, str]]): List of message objects
+            stream (bool): Whether to stream the response
+            
+        Returns:
+            Tuple[Dict[str, str], Dict[str, Any]]: (headers, payload)
+        """
+        payload = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "stream": stream,
+            "messages": messages,
+        }
+        
+        # Add system prompt if available
+        if self.system_prompt:
+            payload["system"] = self.system_prompt
+        
+        return self._headers, payload
+    
+    def _handle_stream_line(self, line: str, parts: List[str]) -> bool:
+        """
+        Process one line of a server-sent event stream from the Claude API.
+        
+        Args:
+            line (str): Decoded line from the response body
+            parts (List[str]): Accumulator for text deltas
+            
+        Returns:
+            bool: True if the line reports that the response stopped at max_tokens
+        """
+        line = line.strip()
+        if not line.startswith("data:"):
+            return False
+        
+        event = orjson.loads(line[5:])
+        event_type = event.get("type")
+        
+        if event_type == "content_block_delta":
+            parts.append(event["delta"].get("text", ""))
+        elif event_type == "message_delta" and event["delta"].get("stop_reason") == "max_tokens":
+            return True
+        elif event_type == "error":
+            raise RuntimeError(f"Stream error: {event.get('error', {}).get('message', event)}")
+        return False
+    
+    def _finish_stream(self, parts: List[str], truncated: bool) -> str:
+        """
+        Join the text deltas of a finished stream, raising TruncatedResponseError if it stopped at max_tokens.
+        
+        Args:
+            parts (List[str]): Text deltas in arrival order
+            truncated (bool): Whether the stream stopped at max_tokens
+            
+        Returns:
+            str: Claude's response
+        """
+        text = "".join(parts)
+        if truncated:
+            logger.warning("Streamed response was truncated at max_tokens")
+            raise TruncatedResponseError(text)
+        return text
+    
+    def _extract_content(self, response_data: Dict[str, Any]) -> str:
+        """
+        Extract the response text from a Claude API response body, raising TruncatedResponseError
+        if it stopped at max_tokens.
+        
+        Args:
+            response_data (Dict[str, Any]): Parsed response body
+            
+        Returns:
+            str: Claude's response
+        """
+        if "content" in response_data:
+            text = response_data["content"][0]["text"]
+        else:
+            text = response_data.get("completion", "No content received")
+        
+        if response_data.get("stop_reason") == "max_tokens":
+            logger.warning("Response was truncated at max_tokens")
+            raise TruncatedResponseError(text)
+        return text
+    
+    def reset_conversation(self) -> None:
+        """
+        Reset the conversation history, keeping only the system prompt.
+        """
+        # The system prompt is kept on the instance, not in the history
+        self.conversation_history.clear()
         
         logger.info("Conversation history reset")
\ No newline at end of file
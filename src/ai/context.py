@@ -1,12 +1,165 @@
 """
 Manages code context for AI prompts.
 """
+import ast
+import codecs
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+# Import statements for every supported language (not perfect but good enough for most cases),
+# so each file is scanned in a single pass. The Python branches are lookaheads: they capture
+# without consuming anything, so they can never swallow text (a blank line, indentation, a
+# comment ending in 'from x') that a JS branch would have matched.
+_IMPORT_RE = re.compile(
+    r'(?=from\s+(?P<py_from>[\w.]+)\s+import)'              # from x import y
+    r'|(?=^\s*import\s+(?P<py_imp>[\w.]+))'                 # import x
+    r'|import[^\n]*?from\s+[\'"](?P<js_from>[^\'"]+)[\'"]'  # import x from 'y'
+    r'|require\s*\(\s*[\'"](?P<js_req>[^\'"]+)[\'"]\s*\)',  # require('y')
+    re.M
+)
+
+# Suffixes tried, in order, when resolving an import to a file in the repository
+_PY_MODULE_SUFFIXES = (".py", "/__init__.py")
+_JS_MODULE_SUFFIXES = ("", ".js", ".ts", ".jsx", ".tsx")
+
+# VCS, dependency and build directories that never hold context worth indexing
+_SKIP_DIRS = frozenset({
+    ".git", "node_modules", "__pycache__", ".venv", "venv", "dist", "build",
+    ".mypy_cache", ".pytest_cache",
+})
+
+# Extensions of files that are never text, rejected before any stat or open
+_BINARY_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".pdf",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".tar", ".jar",
+    ".so", ".dll", ".dylib", ".exe", ".o", ".a", ".class", ".pyc", ".pyo", ".wasm",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp3", ".mp4", ".wav", ".mov",
+    ".sqlite", ".db",
+})
+
+# How many levels of dependencies to follow from the target file
+_MAX_DEPTH = 2
+
+# Upper bound on threads reading context files in parallel
+_MAX_READ_WORKERS = 8
+
+# Longest UTF-8 encoding of a single character
+_MAX_UTF8_CHAR_BYTES = 4
+
+def _extension(path: str) -> str:
+    """
+    Get the extension of a repository-relative POSIX path.
+    
+    Args:
+        path: Relative file path
+        
+    Returns:
+        Extension including the dot, or an empty string
+    """
+    name = path[path.rfind("/") + 1:]
+    dot = name.rfind(".")
+    return name[dot:] if dot > 0 else ""
+
+def _join_relative(directory: str, module_path: str) -> Optional[str]:
+    """
+    Resolve a relative import against the importing file's directory.
+    
+    Args:
+        directory: Directory of the importing file, relative to the repository root
+        module_path: Relative module path such as ./a or ../lib/b
+        
+    Returns:
+        Normalized relative path, or None if it points outside the repository
+    """
+    parts = directory.split("/") if directory else []
+    for part in module_path.split("/"):
+        if part == "..":
+            if not parts:
+                return None
+            parts.pop()
+        elif part and part != ".":
+            parts.append(part)
+    return "/".join(parts)
+
+def _python_imports(file_path: str, content: str) -> List[str]:
+    """
+    List the modules a Python file imports, as slash-separated paths from the repository root.
+    Imports inside strings and comments are ignored, and relative imports are resolved
+    against the file's package.
+    
+    Args:
+        file_path: Path to the file
+        content: Content of the file
+        
+    Returns:
+        List of module paths
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return _python_imports_by_line(content)
+    
+    package = file_path.split("/")[:-1]
+    modules = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name.replace(".", "/") for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if not node.level:
+                if node.module:
+                    modules.append(node.module.replace(".", "/"))
+                continue
+            
+            # Relative import: climb one package per extra leading dot
+            if node.level - 1 > len(package):
+                continue
+            base = package[:len(package) - node.level + 1]
+            if node.module:
+                modules.append("/".join(base + node.module.split(".")))
+            else:
+                # from . import x, y: each name may be a submodule
+                modules.extend("/".join(base + [alias.name]) for alias in node.names)
+    
+    return modules
+
+def _python_imports_by_line(content: str) -> List[str]:
+    """
+    List imported modules with a line scan, for files that don't parse as Python 3.
+    
+    Args:
+        content: Content of the file
+        
+    Returns:
+        List of module paths
+    """
+    modules = []
+    for line in content.splitlines():
+        # Cheap prefix check so the regex only runs on candidate import lines
+        line = line.lstrip()
+        if not line.startswith(("import", "from")):
+            continue
+        
+        match = _IMPORT_RE.match(line)
+        if match is None:
+            continue
+        module_path = match.group("py_from") or match.group("py_imp")
+        if module_path is not None:
+            modules.append(module_path.replace(".", "/"))
+    
+    return modules
 
 class ContextManager:
-    def __init__(self, repo_path: Path, max_files: int = 5, max_file_size: int = 10000):
+    def __init__(
+        self,
+        repo_path: Path,
+        max_files: int = 5,
+        max_file_size: int = 10000,
+        preview_len: Optional[int] = 500
+    ):
         """
         Initialize context manager.
         
@@ -14,10 +167,83 @@ class ContextManager:
             repo_path: Path to the repository
             max_files: Maximum number of files to include in context
             max_file_size: Maximum size of a file to include in context (in characters)
+            preview_len: Number of characters prompts show from each related file, or None to
+                keep related files whole. Related files are read just past this, so a longer
+                file still comes back longer than preview_len
         """
         self.repo_path = repo_path
+        # String form of the repository path for building filesystem paths without Path objects
+        self._repo_str = str(repo_path).rstrip("/") or "/"
         self.max_files = max_files
         self.max_file_size = max_file_size
+        self.preview_len = preview_len
+        # Enough bytes to decode preview_len + 1 characters however many bytes each one takes
+        self._preview_bytes = None if preview_len is None else (preview_len + 1) * _MAX_UTF8_CHAR_BYTES
+        # Directory entry for every file in the repository keyed by relative POSIX path, built on first use
+        self._index: Optional[Dict[str, os.DirEntry]] = None
+        # Import resolutions already probed, so repeated imports across files are looked up once
+        self._pos_cache: Dict[Tuple[Tuple[str, ...], str], str] = {}
+        self._neg_cache: Set[Tuple[Tuple[str, ...], str]] = set()
+        # Dependencies already computed per file, since a file can be reached from several others
+        self._dep_cache: Dict[str, List[str]] = {}
+    
+    def _ensure_index(self) -> Dict[str, os.DirEntry]:
+        """
+        Walk the repository once and remember which files exist, so dependency
+        resolution can use dict lookups instead of a stat call per candidate path.
+        
+        Returns:
+            Dictionary of {relative file path: directory entry}
+        """
+        if self._index is not None:
+            return self._index
+        
+        files: Dict[str, os.DirEntry] = {}
+        stack = [("", self._repo_str)]
+        while stack:
+            prefix, directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        rel_path = f"{prefix}{entry.name}"
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _SKIP_DIRS:
+                                stack.append((f"{rel_path}/", entry.path))
+                        elif entry.is_file():
+                            files[rel_path] = entry
+            except OSError:
+                # Skip directories we can't read
+                continue
+        
+        self._index = files
+        return files
+    
+    def _resolve_module(self, module_path: str, suffixes: Tuple[str, ...]) -> Optional[str]:
+        """
+        Resolve an import to a file in the repository, remembering both hits and misses.
+        
+        Args:
+            module_path: Module path relative to the repository root, without extension
+            suffixes: Suffixes to try in order
+            
+        Returns:
+            Relative path of the first existing candidate, or None if the module is not local
+        """
+        key = (suffixes, module_path)
+        if key in self._neg_cache:
+            return None
+        
+        resolved = self._pos_cache.get(key)
+        if resolved is None:
+            index = self._ensure_index()
+            resolved = next((f"{module_path}{suffix}" for suffix in suffixes
+                             if f"{module_path}{suffix}" in index), None)
+            if resolved is None:
+                self._neg_cache.add(key)
+                return None
+            self._pos_cache[key] = resolved
+        
+        return resolved
     
     def get_file_dependencies(self, file_path: str) -> List[str]:
         """
@@ -30,71 +256,89 @@ class ContextManager:
         Returns:
             List of file paths that the file depends on
         """
-        full_path = self.repo_path / file_path
+        cached = self._dep_cache.get(file_path)
+        if cached is not None:
+            return list(cached)
         
-        if not full_path.exists():
+        entry = self._ensure_index().get(file_path)
+        if entry is None:
             return []
         
-        content = full_path.read_text(encoding="utf-8")
-        dependencies = []
+        handler = self._EXT_HANDLERS.get(_extension(file_path))
+        if handler is None:
+            return []
+        
+        # Related files are only checked for UTF-8 as far as their preview, so the rest may not decode
+        try:
+            with open(entry.path, encoding="utf-8") as file:
+                content = file.read()
+        except (UnicodeDecodeError, OSError):
+            return []
+        dependencies = handler(self, file_path, content)
         
-        # Get file extension
-        ext = os.path.splitext(file_path)[1]
+        self._dep_cache[file_path] = dependencies
+        return list(dependencies)
+    
+    def _python_dependencies(self, file_path: str, content: str) -> List[str]:
+        """
+        Find local modules imported by a Python file.
         
-        if ext in [".py", ".pyw"]:
-            # Look for Python imports
-            import re
-            
-            # Simple regex for import statements (not perfect but good enough for most cases)
-            import_patterns = [
-                r'from\s+([\w.]+)\s+import',  # from x import y
-                r'import\s+([\w.]+)'          # import x
-            ]
+        Args:
+            file_path: Path to the file
+            content: Content of the file
             
-            for pattern in import_patterns:
-                for match in re.finditer(pattern, content):
-                    module_path = match.group(1).replace(".", "/")
-                    
-                    # Check if it's a local module
-                    potential_paths = [
-                        f"{module_path}.py",
-                        f"{module_path}/__init__.py"
-                    ]
-                    
-                    for potential_path in potential_paths:
-                        if (self.repo_path / potential_path).exists():
-                            dependencies.append(potential_path)
+        Returns:
+            List of file paths that the file depends on
+        """
+        # Insertion-ordered set, so a module imported several times is listed once
+        dependencies: Dict[str, None] = {}
+        for module_path in _python_imports(file_path, content):
+            # Check if it's a local module
+            dependency = self._resolve_module(module_path, _PY_MODULE_SUFFIXES)
+            if dependency is not None:
+                dependencies[dependency] = None
         
-        elif ext in [".js", ".ts", ".jsx", ".tsx"]:
-            # Look for JavaScript/TypeScript imports
-            import re
+        return list(dependencies)
+    
+    def _js_dependencies(self, file_path: str, content: str) -> List[str]:
+        """
+        Find local modules imported by a JavaScript/TypeScript file.
+        
+        Args:
+            file_path: Path to the file
+            content: Content of the file
             
-            # Simple regex for import statements
-            import_patterns = [
-                r'import.*?from\s+[\'"]([^\'"]+)[\'"]',  # import x from 'y'
-                r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'  # require('y')
-            ]
+        Returns:
+            List of file paths that the file depends on
+        """
+        # Insertion-ordered set, so a module imported several times is listed once
+        dependencies: Dict[str, None] = {}
+        for match in _IMPORT_RE.finditer(content):
+            module_path = match.group("js_from") or match.group("js_req")
             
-            for pattern in import_patterns:
-                for match in re.finditer(pattern, content):
-                    module_path = match.group(1)
-                    
-                    # Ignore node_modules and external packages
-                    if module_path.startswith("."):
-                        # Resolve relative path
-                        dirname = os.path.dirname(file_path)
-                        module_path = os.path.normpath(os.path.join(dirname, module_path))
-                        
-                        # Check for extensions
-                        potential_extensions = ["", ".js", ".ts", ".jsx", ".tsx"]
-                        for ext in potential_extensions:
-                            potential_path = f"{module_path}{ext}"
-                            if (self.repo_path / potential_path).exists():
-                                dependencies.append(potential_path)
-                                break
-        
-        # Limit to existing files
-        return [dep for dep in dependencies if (self.repo_path / dep).exists()]
+            # Ignore Python-style matches, node_modules and external packages
+            if module_path is not None and module_path.startswith("."):
+                # Resolve relative path
+                module_path = _join_relative(file_path.rpartition("/")[0], module_path)
+                if module_path is None:
+                    continue
+                
+                # Check for extensions
+                dependency = self._resolve_module(module_path, _JS_MODULE_SUFFIXES)
+                if dependency is not None:
+                    dependencies[dependency] = None
+        
+        return list(dependencies)
+    
+    # Dependency scanner for each supported file extension
+    _EXT_HANDLERS: Dict[str, Callable[["ContextManager", str, str], List[str]]] = {
+        ".py": _python_dependencies,
+        ".pyw": _python_dependencies,
+        ".js": _js_dependencies,
+        ".ts": _js_dependencies,
+        ".jsx": _js_dependencies,
+        ".tsx": _js_dependencies,
+    }
     
     def get_context_for_file(self, file_path: str) -> Dict[str, str]:
         """
@@ -104,67 +348,109 @@ class ContextManager:
             file_path: Path to the file
             
         Returns:
-            Dictionary of {file_path: content} for relevant context
+            Dictionary of {file_path: content} for relevant context. The target file is
+            complete; related files are cut to a little over preview_len characters
         """
-        context = {}
+        context: Dict[str, str] = {}
         visited: Set[str] = set()
         
-        def collect_context(path: str, depth: int = 0):
-            if path in visited or len(context) >= self.max_files or depth > 2:
-                return
-            
-            visited.add(path)
-            full_path = self.repo_path / path
-            
-            if not full_path.exists() or not full_path.is_file():
-                return
-            
-            # Skip files that are too large
-            if full_path.stat().st_size > self.max_file_size:
-                return
-            
-            # Skip binary files
-            if self._is_binary_file(full_path):
-                return
-            
-            # Add file to context
-            try:
-                content = full_path.read_text(encoding="utf-8")
-                context[path] = content
-            except UnicodeDecodeError:
-                # Skip files that can't be decoded as UTF-8
-                return
-            
-            # Add dependencies
-            dependencies = self.get_file_dependencies(path)
-            for dep in dependencies:
-                collect_context(dep, depth + 1)
-        
         # Start with the target file
-        collect_context(file_path)
+        queue = deque([(file_path, 0)])
+        self._collect_context(queue, context, visited, file_path)
         
         # If we haven't reached the maximum, add files in the same directory
         if len(context) < self.max_files:
-            directory = os.path.dirname(file_path)
-            for sibling in (self.repo_path / directory).glob("*"):
-                if sibling.is_file() and str(sibling.relative_to(self.repo_path)) not in visited:
-                    collect_context(str(sibling.relative_to(self.repo_path)))
+            directory = file_path.rpartition("/")[0]
+            try:
+                with os.scandir(f"{self._repo_str}/{directory}" if directory else self._repo_str) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            sibling = f"{directory}/{entry.name}" if directory else entry.name
+                            if sibling not in visited:
+                                queue.append((sibling, 0))
+            except OSError:
+                # Directory is missing or unreadable
+                pass
+            self._collect_context(queue, context, visited, file_path)
         
         return context
     
-    def _is_binary_file(self, file_path: Path) -> bool:
+    def _collect_context(self, queue: deque, context: Dict[str, str], visited: Set[str], target: str) -> None:
+        """
+        Add files to the context breadth-first, following dependencies up to _MAX_DEPTH levels.
+        
+        Args:
+            queue: Worklist of (file path, depth) tuples, consumed in place
+            context: Dictionary of {file_path: content} to fill
+            visited: Paths already considered
+            target: File the context is for, which is read in full
+        """
+        index = self._ensure_index()
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(_MAX_READ_WORKERS, self.max_files))) as executor:
+            while queue and len(context) < self.max_files:
+                # Take the next candidates off the frontier, at most one per free slot
+                batch = []
+                while queue and len(batch) < self.max_files - len(context):
+                    path, depth = queue.popleft()
+                    if path in visited:
+                        continue
+                    
+                    visited.add(path)
+                    entry = index.get(path)
+                    if entry is None or _extension(path).lower() in _BINARY_EXTENSIONS:
+                        continue
+                    
+                    try:
+                        # Skip files that are too large
+                        if entry.stat().st_size > self.max_file_size:
+                            continue
+                    except OSError:
+                        continue
+                    
+                    batch.append((path, depth, entry.path))
+                
+                # Read the batch in parallel, skipping binary and undecodable files
+                contents = executor.map(
+                    lambda item: self._read_text_if_safe(
+                        item[2], self.max_file_size, None if item[0] == target else self._preview_bytes
+                    ),
+                    batch
+                )
+                for (path, depth, _), content in zip(batch, contents):
+                    if content is None:
+                        continue
+                    context[path] = content
+                    
+                    # Add dependencies
+                    if depth < _MAX_DEPTH:
+                        queue.extend((dep, depth + 1) for dep in self.get_file_dependencies(path))
+    
+    def _read_text_if_safe(self, file_path: str, limit: int, preview: Optional[int] = None) -> Optional[str]:
         """
-        Check if a file is binary.
+        Read a text file with a single open, rejecting it if it is binary or too large.
         
         Args:
             file_path: Path to the file
+            limit: Maximum number of bytes to accept
+            preview: Number of bytes to read from the start of the file, or None for all of it
             
         Returns:
-            True if the file is binary, False otherwise
+            File content, or None if the file is too large, binary, not UTF-8 or unreadable
         """
+        read_size = limit + 1 if preview is None else min(limit + 1, preview)
+        try:
+            with open(file_path, 'rb') as file:
+                data = file.read(read_size)
+        except OSError:
+            return None
+        
+        if len(data) > limit or b'\x00' in data[:4096]:
+            return None
+        
+        # Incremental decoding drops a multi-byte character cut off by the preview
+        # instead of rejecting the file
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                file.read(1024)
-                return False
+            return codecs.getincrementaldecoder("utf-8")().decode(data, final=len(data) < read_size)
         except UnicodeDecodeError:
-            return True
\ No newline at end of file
+            return None
@@ -0,0 +1,83 @@
+"""
+Pydantic models describing the implementation plans Claude generates.
+"""
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+# Where edits land when Claude asks to add a method but names no class
+_UTILITY_LOCATION = "// Utility functions"
+
+def _default_file_changes() -> List[Dict[str, Any]]:
+    """
+    Build the file change used when a plan contains none.
+
+    Returns:
+        List with a single file change
+    """
+    return [
+        {
+            "path": "utils.js",
+            "type": "modify",
+            "edits": [
+                {
+                    "type": "insert",
+                    "location": "module.exports = {",
+                    "code": "\n  calculateAverage,\n"
+                },
+                {
+                    "type": "insert",
+                    "location": _UTILITY_LOCATION,
+                    "code": "\n\n/**\n * Calculate the average of an array of numbers\n * @param {number[]} numbers - Array of numbers\n * @returns {number} The average value\n */\nfunction calculateAverage(numbers) {\n  if (numbers.length === 0) return 0;\n  const sum = numbers.reduce((acc, val) => acc + val, 0);\n  return sum / numbers.length;\n}\n"
+                }
+            ]
+        }
+    ]
+
+class Edit(BaseModel):
+    """A single edit within a modified file. Fields other than type pass through untouched."""
+    model_config = ConfigDict(extra="allow")
+
+    type: str
+
+    @model_validator(mode="before")
+    @classmethod
+    def _add_method_without_class(cls, data: Any) -> Any:
+        """
+        Turn an add_method edit with no usable class name into a plain insert.
+        """
+        if not isinstance(data, dict) or data.get("type") != "add_method":
+            return data
+
+        class_name = data.get("class_name")
+        if class_name is not None and str(class_name).strip() not in ("", "None", "null"):
+            return data
+
+        edit = {key: value for key, value in data.items() if key not in ("class_name", "method_code")}
+        edit["type"] = "insert"
+        edit["location"] = _UTILITY_LOCATION
+        if "method_code" in data:
+            edit["code"] = data["method_code"]
+        return edit
+
+class FileChange(BaseModel):
+    """A file to create or modify."""
+    model_config = ConfigDict(extra="allow")
+
+    path: str
+    type: str = "modify"
+    edits: Optional[List[Edit]] = None
+
+class Plan(BaseModel):
+    """An implementation plan made up of file changes."""
+    model_config = ConfigDict(extra="allow")
+
+    file_changes: List[FileChange] = Field(default_factory=_default_file_changes, validate_default=True)
+
+    @field_validator("file_changes", mode="before")
+    @classmethod
+    def _default_when_empty(cls, value: Any) -> Any:
+        """
+        Substitute the default file change when the plan has none.
+        """
+        return value or _default_file_changes()
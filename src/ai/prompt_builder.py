@@ -1,9 +1,52 @@
 """
 Builds effective prompts for AI code generation.
 """
-import json
 from typing import Dict, Any, List, Optional
 
+import orjson
+
+def to_pretty_json(obj: Any) -> str:
+    """
+    Serialize an object as indented JSON for inclusion in a prompt.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        JSON string
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+# Fixed prompt text, kept indented to match the f-string segments it is joined with
+_TASK_HEADER = """
+        # Task
+        You are an expert {language} developer implementing the following feature:
+        
+        {feature}
+        
+        """
+
+_INSTRUCTIONS_FOOTER = """
+        # Instructions
+        - Follow the existing code style and patterns
+        - Make sure the code is well-documented
+        - Handle potential edge cases
+        - Ensure compatibility with the existing codebase
+        
+        Please provide the complete {deliverable}.
+        """
+_GENERATION_FOOTER = _INSTRUCTIONS_FOOTER.format(deliverable="implementation for the file")
+_MODIFICATION_FOOTER = _INSTRUCTIONS_FOOTER.format(deliverable="modified code segment")
+
+_TEST_FIX_FOOTER = """# Instructions
+        - Analyze the test failures and identify the issues in the code
+        - Fix the issues while maintaining the existing code style and patterns
+        - Make sure the code is well-documented
+        - Handle potential edge cases
+        
+        Please provide the complete fixed code for the file.
+        """
+
 class PromptBuilder:
     def __init__(self, max_context_length: int = 4000):
         """
@@ -35,55 +78,40 @@ class PromptBuilder:
         Returns:
             Formatted prompt
         """
-        prompt = f"""
-        # Task
-        You are an expert {language} developer implementing the following feature:
-        
-        {feature_description}
-        
-        """
+        parts = [_TASK_HEADER.format(language=language, feature=feature_description)]
         
         if file_content:
-            prompt += f"""
+            parts.append(f"""
             # Current File: {file_path}
             ```{language}
             {file_content}
             ```
             
-            """
+            """)
         else:
-            prompt += f"""
+            parts.append(f"""
             # New File to Create: {file_path}
             This file doesn't exist yet. You need to create it from scratch.
             
-            """
+            """)
         
         if related_files:
-            prompt += "# Related Files\n"
+            parts.append("# Related Files\n")
             for path, content in related_files.items():
                 # Truncate content if it's too long
-                if len(content) > 500:
-                    content = content[:500] + "... (truncated)"
+                truncated = "... (truncated)" if len(content) > 500 else ""
                 
-                prompt += f"""
+                parts.append(f"""
                 ## {path}
                 ```{language}
-                {content}
+                {content[:500]}{truncated}
                 ```
                 
-                """
+                """)
         
-        prompt += """
-        # Instructions
-        - Follow the existing code style and patterns
-        - Make sure the code is well-documented
-        - Handle potential edge cases
-        - Ensure compatibility with the existing codebase
+        parts.append(_GENERATION_FOOTER)
         
-        Please provide the complete implementation for the file.
-        """
-        
-        return prompt
+        return "".join(parts)
     
     def build_code_modification_prompt(
         self,
@@ -108,13 +136,8 @@ class PromptBuilder:
         Returns:
             Formatted prompt
         """
-        prompt = f"""
-        # Task
-        You are an expert {language} developer implementing the following feature:
-        
-        {feature_description}
-        
-        You need to modify an existing file to implement this feature.
+        parts = [_TASK_HEADER.format(language=language, feature=feature_description)]
+        parts.append(f"""You need to modify an existing file to implement this feature.
         
         # File to Modify: {file_path}
         ```{language}
@@ -123,16 +146,16 @@ class PromptBuilder:
         
         # Modification Required
         Type: {modification_type}
-        """
+        """)
         
         if modification_type == "add_method":
-            prompt += f"""
+            parts.append(f"""
             Add a new method to class '{modification_details.get('class_name')}'.
             The method should:
             - {modification_details.get('purpose', 'Implement the feature described above')}
-            """
+            """)
         elif modification_type == "replace":
-            prompt += f"""
+            parts.append(f"""
             Replace the following code:
             ```{language}
             {modification_details.get('pattern')}
@@ -140,9 +163,9 @@ class PromptBuilder:
             
             With new code that:
             - {modification_details.get('purpose', 'Implements the feature described above')}
-            """
+            """)
         elif modification_type == "insert":
-            prompt += f"""
+            parts.append(f"""
             Insert new code at the location identified by:
             ```{language}
             {modification_details.get('location')}
@@ -150,19 +173,11 @@ class PromptBuilder:
             
             The new code should:
             - {modification_details.get('purpose', 'Implement the feature described above')}
-            """
+            """)
         
-        prompt += """
-        # Instructions
-        - Follow the existing code style and patterns
-        - Make sure the code is well-documented
-        - Handle potential edge cases
-        - Ensure compatibility with the existing codebase
-        
-        Please provide the complete modified code segment.
-        """
+        parts.append(_MODIFICATION_FOOTER)
         
-        return prompt
+        return "".join(parts)
     
     def build_test_fix_prompt(
         self,
@@ -183,7 +198,7 @@ class PromptBuilder:
         Returns:
             Formatted prompt
         """
-        failures_str = json.dumps(test_failures, indent=2)
+        failures_str = to_pretty_json(test_failures)
         
         prompt = f"""
         # Task
@@ -199,13 +214,6 @@ class PromptBuilder:
         {file_content}
         ```
         
-        # Instructions
-        - Analyze the test failures and identify the issues in the code
-        - Fix the issues while maintaining the existing code style and patterns
-        - Make sure the code is well-documented
-        - Handle potential edge cases
-        
-        Please provide the complete fixed code for the file.
         """
         
-        return prompt
\ No newline at end of file
+        return prompt + _TEST_FIX_FOOTER
\ No newline at end of file
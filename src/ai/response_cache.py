@@ -0,0 +1,178 @@
+"""
+Caches Claude responses so repeated prompts skip the API round-trip.
+"""
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import diskcache
+except ImportError:  # Optional dependency: fall back to an in-memory cache
+    diskcache = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "neurocommit" / "claude"
+
+# Generations are nondeterministic, so a persisted response is only replayed for this long
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Bytes the persistent cache may use before diskcache evicts the least recently used entries
+DEFAULT_SIZE_LIMIT = 256 * 1024 * 1024
+
+# Responses kept in memory, least recently used evicted first
+_MAX_MEMORY_ENTRIES = 256
+
+class ResponseCache:
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        semantic_threshold: Optional[float] = None,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        size_limit: int = DEFAULT_SIZE_LIMIT
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory for the persistent cache (requires diskcache), or None for memory only
+            semantic_threshold: Cosine similarity above which a similar prompt counts as a hit,
+                or None to disable the semantic tier (requires sentence-transformers and faiss)
+            ttl_seconds: Seconds a persisted response stays valid, or None to keep it until evicted
+            size_limit: Maximum size of the persistent cache in bytes
+        """
+        self._memory: OrderedDict = OrderedDict()
+        self._disk = None
+        self.ttl_seconds = ttl_seconds
+        if cache_dir is not None:
+            if diskcache is None:
+                logger.warning("Persistent response cache requires diskcache; keeping responses in memory only")
+            else:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    self._disk = diskcache.Cache(str(cache_dir), size_limit=size_limit)
+                except OSError as e:
+                    logger.warning(f"Could not open response cache at {cache_dir}: {str(e)}")
+
+        self.semantic_threshold = semantic_threshold
+        self._encoder = None
+        self._index = None
+        self._semantic_entries: List[Tuple[str, int, str]] = []
+        if semantic_threshold is not None:
+            self._init_semantic_tier()
+
+    @staticmethod
+    def make_key(model: str, max_tokens: int, prompt: str) -> bytes:
+        """
+        Build the exact-match cache key for a request.
+
+        Args:
+            model: Claude model name
+            max_tokens: Maximum number of tokens requested
+            prompt: Prompt text
+
+        Returns:
+            Digest identifying the request
+        """
+        return hashlib.blake2b(f"{model}\0{max_tokens}\0{prompt}".encode("utf-8")).digest()
+
+    def get(self, model: str, max_tokens: int, prompt: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            model: Claude model name
+            max_tokens: Maximum number of tokens requested
+            prompt: Prompt text
+
+        Returns:
+            Cached response or None on a miss
+        """
+        key = self.make_key(model, max_tokens, prompt)
+
+        response = self._memory.get(key)
+        if response is not None:
+            self._memory.move_to_end(key)
+        elif self._disk is not None:
+            response = self._disk.get(key)
+            if response is not None:
+                self._remember(key, response)
+
+        if response is None and self._index is not None:
+            response = self._semantic_lookup(model, max_tokens, prompt)
+
+        return response
+
+    def set(self, model: str, max_tokens: int, prompt: str, response: str) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            model: Claude model name
+            max_tokens: Maximum number of tokens requested
+            prompt: Prompt text
+            response: Response to cache
+        """
+        key = self.make_key(model, max_tokens, prompt)
+        self._remember(key, response)
+        if self._disk is not None:
+            self._disk.set(key, response, expire=self.ttl_seconds)
+
+        if self._index is not None:
+            self._index.add(self._embed(prompt))
+            self._semantic_entries.append((model, max_tokens, response))
+
+    def _remember(self, key: bytes, response: str) -> None:
+        """
+        Store a response in the in-memory tier, evicting the least recently used one when full.
+
+        Args:
+            key: Exact-match cache key
+            response: Response to store
+        """
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        if len(self._memory) > _MAX_MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def _init_semantic_tier(self) -> None:
+        """
+        Load the embedding model and similarity index for the semantic tier.
+        """
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            logger.warning("Semantic response cache requires sentence-transformers and faiss; disabling it")
+            return
+
+        self._encoder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+        self._index = faiss.IndexFlatIP(self._encoder.get_sentence_embedding_dimension())
+
+    def _embed(self, prompt: str):
+        """
+        Embed a prompt as a normalized vector so inner product equals cosine similarity.
+        """
+        return self._encoder.encode([prompt], normalize_embeddings=True).astype("float32")
+
+    def _semantic_lookup(self, model: str, max_tokens: int, prompt: str) -> Optional[str]:
+        """
+        Find the response for the most similar cached prompt above the threshold.
+        """
+        if not self._semantic_entries:
+            return None
+
+        scores, ids = self._index.search(self._embed(prompt), 1)
+        score, idx = float(scores[0][0]), int(ids[0][0])
+        if idx < 0 or score < self.semantic_threshold:
+            return None
+
+        entry_model, entry_max_tokens, response = self._semantic_entries[idx]
+        if entry_model != model or entry_max_tokens != max_tokens:
+            return None
+
+        logger.info(f"Semantic cache hit (similarity {score:.3f})")
+        return response
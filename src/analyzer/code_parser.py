@@ -1,10 +1,356 @@
 """
 Language-agnostic code parsing for various programming languages.
 """
+import ast
+import asyncio
+import logging
 import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, Callable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+try:
+    import hyperscan
+except ImportError:  # Optional dependency: without it every extractor runs its regexes
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extractor output changes, so persisted parse results are invalidated
+PARSER_VERSION = 1
+
+# Parsed files kept per CodeParser; entries are invalidated by a change in mtime or size
+_PARSE_CACHE_SIZE = 256
+# Files handed to each worker process at a time by parse_files
+_PARSE_CHUNKSIZE = 32
+
+class ImportInfo(NamedTuple):
+    """An import; which fields are set depends on the language and import form."""
+    module: Optional[str] = None
+    symbols: Optional[List[str]] = None
+    alias: Optional[str] = None
+    default: Optional[str] = None
+    namespace: Optional[str] = None
+    package: Optional[str] = None
+    static: Optional[bool] = None
+    path: Optional[str] = None
+    contract: Optional[str] = None
+
+class MethodInfo(NamedTuple):
+    """A method found inside a class body."""
+    name: str
+    params: str
+    class_name: Optional[str] = None
+
+class ClassInfo(NamedTuple):
+    """A class, React component or Solidity contract."""
+    name: str
+    type: Optional[str] = None
+    parent_classes: Optional[List[str]] = None
+    parent_class: Optional[str] = None
+    interfaces: Optional[List[str]] = None
+    parent_contracts: Optional[List[str]] = None
+    methods: Optional[List[MethodInfo]] = None
+    props: Optional[str] = None
+
+class FunctionInfo(NamedTuple):
+    """A top-level function."""
+    name: str
+    params: str
+    return_type: Optional[str] = None
+    type: Optional[str] = None
+    exported: bool = False
+
+class VariableInfo(NamedTuple):
+    """A constant or module-level variable."""
+    name: str
+    value: Optional[str]
+    type: str
+    data_type: Optional[str] = None
+    visibility: Optional[str] = None
+
+def _fuse_patterns(
+    alternatives: List[Tuple[str, Callable[[Tuple[str, ...]], Any]]],
+    flags: int = 0
+) -> Tuple[re.Pattern, Dict[int, Tuple[Callable[[Tuple[str, ...]], Any], int]]]:
+    """
+    Fuse several patterns into one alternation so a file is scanned once instead of once per pattern.
+    Each alternative is wrapped in an outer group; the group that closes last (match.lastindex)
+    identifies which alternative matched.
+    
+    Args:
+        alternatives: List of (pattern source, parser) pairs; each parser receives that pattern's groups
+        flags: Regex flags for the combined pattern
+        
+    Returns:
+        Tuple of (compiled pattern, {outer group index: (parser, number of inner groups)})
+    """
+    parts = []
+    parsers = {}
+    index = 1
+    for source, parser in alternatives:
+        group_count = re.compile(source, flags).groups
+        parts.append(f'({source})')
+        parsers[index] = (parser, group_count)
+        index += group_count + 1
+    return re.compile('|'.join(parts), flags), parsers
+
+def _scan_fused(pattern: re.Pattern, parsers: Dict[int, Tuple[Callable, int]], content: str):
+    """
+    Yield the parsed result of every match of a fused pattern, in source order.
+    
+    Args:
+        pattern: Pattern built by _fuse_patterns
+        parsers: Parser table built by _fuse_patterns
+        content: Source code
+    """
+    for match in pattern.finditer(content):
+        outer = match.lastindex
+        parser, group_count = parsers[outer]
+        yield parser(match.groups()[outer:outer + group_count])
+
+# Patterns are compiled once at import time; fused tables pair each alternative with a parser for its groups
+
+# Comma-separated lists (symbols, parents, interfaces) split and stripped in one pass
+_CSV_RE = re.compile(r'\s*,\s*')
+
+# Python
+_PY_IMPORT_RE, _PY_IMPORT_PARSERS = _fuse_patterns([
+    (r'^\s*import\s+([\w.]+)(?:\s+as\s+(\w+))?',
+     lambda g: ImportInfo(module=g[0], alias=g[1] or None)),
+    (r'^\s*from\s+([\w.]+)\s+import\s+([\w.*, \t]+)',
+     lambda g: ImportInfo(module=g[0], symbols=_CSV_RE.split(g[1].strip())))
+], re.MULTILINE)
+_PY_CLASS_RE = re.compile(r'^\s*class\s+(\w+)(?:\(([^)]*)\))?:', re.MULTILINE)
+_PY_INDENT_RE = re.compile(r'^\s+', re.MULTILINE)
+_PY_BODY_LINE_RE = re.compile(r'^([ \t]*)\S', re.MULTILINE)
+_PY_FUNCTION_RE = re.compile(r'^\s*def\s+(\w+)\s*\(([^)]*)\)(?:\s*->\s*([^:]+))?:', re.MULTILINE)
+_PY_VARIABLE_RE = re.compile(r'^([A-Z][A-Z0-9_]*)\s*=\s*(.+?)$', re.MULTILINE)
+_PY_CONSTANT_NAME_RE = re.compile(r'[A-Z][A-Z0-9_]*')
+
+# JavaScript/TypeScript
+_JS_IMPORT_RE, _JS_IMPORT_PARSERS = _fuse_patterns([
+    (r'import\s+{([^}]+)}\s+from\s+[\'"]([^\'"]+)[\'"]',
+     lambda g: ImportInfo(module=g[1], symbols=_CSV_RE.split(g[0].strip()))),
+    (r'import\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]',
+     lambda g: ImportInfo(module=g[1], default=g[0])),
+    (r'import\s+\*\s+as\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]',
+     lambda g: ImportInfo(module=g[1], namespace=g[0])),
+    (r'(?:const|let|var)\s+{([^}]+)}\s+=\s+require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
+     lambda g: ImportInfo(module=g[1], symbols=_CSV_RE.split(g[0].strip()))),
+    (r'(?:const|let|var)\s+(\w+)\s+=\s+require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
+     lambda g: ImportInfo(module=g[1], default=g[0]))
+])
+_JS_CLASS_RE = re.compile(r'^\s*class\s+(\w+)(?:\s+extends\s+(\w+))?', re.MULTILINE)
+# Method pattern (including constructor)
+_JS_METHOD_RES = [
+    re.compile(r'(?:async\s+)?(?:constructor|[\w]+)\s*\(([^)]*)\)'),
+    re.compile(r'(?:async\s+)?(?:get|set)\s+([\w]+)\s*\(([^)]*)\)'),
+    re.compile(r'(?:static\s+)?(?:async\s+)?([\w]+)\s*\(([^)]*)\)')
+]
+_JS_COMPONENT_PATTERNS = [
+    (re.compile(r'^\s*(?:export\s+)?(?:default\s+)?function\s+(\w+)\s*\(([^)]*)\)', re.MULTILINE),
+     lambda m: ClassInfo(name=m.group(1), type='function_component', props=m.group(2).strip())),
+    (re.compile(r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:React\.)?(?:memo\()?(?:forwardRef\()?(?:\([^)]*\)|[^=]+)=>', re.MULTILINE),
+     lambda m: ClassInfo(name=m.group(1), type='arrow_component'))
+]
+# Plain declarations come before the export/async form so they aren't reported as exported
+_JS_FUNCTION_RE, _JS_FUNCTION_PARSERS = _fuse_patterns([
+    (r'^\s*function\s+(\w+)\s*\(([^)]*)\)',
+     lambda g: FunctionInfo(name=g[0], params=g[1].strip(), type='declaration')),
+    (r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s+(\w+)\s*\(([^)]*)\)',
+     lambda g: FunctionInfo(name=g[0], params=g[1].strip(), type='declaration', exported=True)),
+    (r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>',
+     lambda g: FunctionInfo(name=g[0], params=g[1].strip(), type='arrow', exported=True)),
+    (r'^\s*(?:let|var)\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>',
+     lambda g: FunctionInfo(name=g[0], params=g[1].strip(), type='arrow')),
+    (r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:async\s*)?function\s*\(([^)]*)\)',
+     lambda g: FunctionInfo(name=g[0], params=g[1].strip(), type='expression', exported=True))
+], re.MULTILINE)
+_JS_VARIABLE_RE, _JS_VARIABLE_PARSERS = _fuse_patterns([
+    (r'^\s*(?:export\s+)?const\s+([A-Z][A-Z0-9_]*)\s*=\s*(.+?)$',
+     lambda g: VariableInfo(name=g[0], value=g[1].strip(), type='constant')),
+    (r'^\s*(?:export\s+)?const\s+(\w+)\s*=\s*(.+?)$',
+     lambda g: VariableInfo(name=g[0], value=g[1].strip(), type='constant')),
+    (r'^\s*(?:export\s+)?let\s+(\w+)\s*=\s*(.+?)$',
+     lambda g: VariableInfo(name=g[0], value=g[1].strip(), type='variable')),
+    (r'^\s*(?:export\s+)?var\s+(\w+)\s*=\s*(.+?)$',
+     lambda g: VariableInfo(name=g[0], value=g[1].strip(), type='variable'))
+], re.MULTILINE)
+
+# Java
+_JAVA_IMPORT_RE = re.compile(r'^\s*import\s+(static\s+)?([\w.]+)(?:\.\*)?;', re.MULTILINE)
+_JAVA_CLASS_RE = re.compile(r'(?:public|protected|private)?\s*(?:abstract|final)?\s*class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?')
+_JAVA_VARIABLE_RE = re.compile(r'^\s*(?:public|private|protected)?\s*(?:static\s+final|final\s+static)?\s+(\w+)\s+([A-Z][A-Z0-9_]*)\s*=\s*(.+?);', re.MULTILINE)
+
+# Solidity
+_SOL_IMPORT_RE = re.compile(r'import\s+[\'"]([^\'"]+)[\'"]\s*;')
+_SOL_INHERIT_RE = re.compile(r'is\s+([\w,\s]+){')
+_SOL_CONTRACT_RE = re.compile(r'(?:contract|library|interface)\s+(\w+)(?:\s+is\s+([\w\s,]+))?\s*{')
+_SOL_METHOD_RE = re.compile(r'function\s+(\w+)\s*\(([^)]*)\)')
+_SOL_FUNCTION_RE = re.compile(r'function\s+(\w+)\s*\(([^)]*)\)(?:\s+(?:external|public|internal|private))?\s*(?:(?:pure|view|payable))?\s*(?:returns\s*\([^)]*\))?\s*{')
+_SOL_VARIABLE_RE = re.compile(r'(uint|int|bool|address|string|bytes\d*)\s+(public|private|internal)?\s*(\w+)\s*(?:=\s*([^;]+))?;')
+
+# Every pattern an extractor needs, by language; a single Hyperscan pass over these tells which
+# kinds of symbol a file contains, so extractors with no possible match are skipped.
+# Python is parsed with ast, which finds definitions these patterns would miss, so it isn't prefiltered
+_PREFILTER_PATTERNS = {
+    'javascript': [
+        ('imports', _JS_IMPORT_RE),
+        ('classes', _JS_CLASS_RE),
+        ('classes', _JS_COMPONENT_PATTERNS[0][0]),
+        ('classes', _JS_COMPONENT_PATTERNS[1][0]),
+        ('functions', _JS_FUNCTION_RE),
+        ('variables', _JS_VARIABLE_RE)
+    ],
+    'java': [
+        ('imports', _JAVA_IMPORT_RE),
+        ('classes', _JAVA_CLASS_RE),
+        ('variables', _JAVA_VARIABLE_RE)
+    ],
+    'solidity': [
+        ('imports', _SOL_IMPORT_RE),
+        ('imports', _SOL_INHERIT_RE),
+        ('classes', _SOL_CONTRACT_RE),
+        ('functions', _SOL_FUNCTION_RE),
+        ('variables', _SOL_VARIABLE_RE)
+    ]
+}
+_PREFILTER_PATTERNS['typescript'] = _PREFILTER_PATTERNS['javascript']
+
+@lru_cache(maxsize=8)
+def _parse_python(content: str) -> Optional[ast.Module]:
+    """
+    Parse Python source once for all four extractors.
+    
+    Args:
+        content: Source code
+        
+    Returns:
+        Module tree, or None if the source isn't valid Python 3
+    """
+    try:
+        return ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+@lru_cache(maxsize=None)
+def _hyperscan_database(language: str) -> Optional[Tuple[Any, List[str]]]:
+    """
+    Compile a language's extractor patterns into one Hyperscan database, once per process.
+    
+    Args:
+        language: Programming language
+        
+    Returns:
+        Tuple of (database, symbol kind for each pattern id), or None if Hyperscan can't be used
+    """
+    patterns = _PREFILTER_PATTERNS.get(language)
+    if hyperscan is None or not patterns:
+        return None
+    
+    base_flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[pattern.pattern.encode('utf-8') for _, pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[
+                base_flags | (hyperscan.HS_FLAG_MULTILINE if pattern.flags & re.MULTILINE else 0)
+                for _, pattern in patterns
+            ]
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Could not compile Hyperscan patterns for {language}: {str(e)}")
+        return None
+    
+    return database, [kind for kind, _ in patterns]
+
+def _find_closing_brace(content: str, start_index: int) -> int:
+    """
+    Find the closing brace that matches an already-opened brace, jumping between braces with str.find.
+    
+    Args:
+        content: Source code
+        start_index: Index just past the opening brace
+        
+    Returns:
+        Index of the matching closing brace, or len(content) if it is never closed
+    """
+    depth = 1
+    i = start_index
+    n = len(content)
+    while i < n:
+        close = content.find('}', i)
+        if close == -1:
+            return n
+        
+        opening = content.find('{', i, close)
+        if opening != -1:
+            depth += 1
+            i = opening + 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return close
+            i = close + 1
+    return n
+
+@lru_cache(maxsize=64)
+def _py_method_pattern(class_indent: str) -> re.Pattern:
+    """
+    Get the pattern for methods defined at a class body's indentation, compiled once per indent.
+    
+    Args:
+        class_indent: Leading whitespace of the class body
+        
+    Returns:
+        Compiled method pattern
+    """
+    return re.compile(r'^' + class_indent + r'def\s+(\w+)\s*\(([^)]*)\):', re.MULTILINE)
+
+@lru_cache(maxsize=64)
+def _py_dedent_pattern(body_indent: int) -> re.Pattern:
+    """
+    Get the pattern for the first non-blank line indented less than a function body, compiled once per indent.
+    
+    Args:
+        body_indent: Number of leading whitespace characters in the function body
+        
+    Returns:
+        Compiled dedent pattern
+    """
+    return re.compile(rf'^(?![ \t]{{{body_indent}}})[ \t]*\S', re.MULTILINE)
+
+@lru_cache(maxsize=256)
+def _function_location_patterns(language: str, function_name: str) -> Tuple[re.Pattern, ...]:
+    """
+    Get the patterns that locate a named function's definition, compiled once per name.
+    
+    Args:
+        language: Programming language
+        function_name: Name of the function
+        
+    Returns:
+        Compiled patterns to try in order
+    """
+    name = re.escape(function_name)
+    if language == 'python':
+        return (re.compile(rf'def\s+{name}\s*\([^)]*\)(?:\s*->.*?)?:'),)
+    if language in ['javascript', 'typescript']:
+        return (
+            re.compile(rf'function\s+{name}\s*\([^)]*\)\s*{{'),
+            re.compile(rf'const\s+{name}\s*=\s*(?:async\s*)?\([^)]*\)\s*=>\s*{{'),
+            re.compile(rf'const\s+{name}\s*=\s*function\s*\([^)]*\)\s*{{')
+        )
+    if language == 'java':
+        return (re.compile(rf'(?:public|private|protected)?\s*(?:static\s+)?\w+\s+{name}\s*\([^)]*\)'),)
+    return ()
 
 class CodeParser:
     def __init__(self, repo_path: Path):
@@ -15,6 +361,7 @@ class CodeParser:
             repo_path: Path to the repository
         """
         self.repo_path = repo_path
+        self._repo_str = str(repo_path)
         self.language_extensions = {
             'python': ['.py', '.pyw'],
             'javascript': ['.js', '.jsx'],
@@ -38,6 +385,47 @@ class CodeParser:
         for language, extensions in self.language_extensions.items():
             for ext in extensions:
                 self.extension_to_language[ext] = language
+        
+        # Hyperscan scratch space can't be shared between threads
+        self._hyperscan_local = threading.local()
+        
+        # (file_path, mtime_ns, size) -> parse result, least recently used first
+        self._parse_cache: OrderedDict = OrderedDict()
+        
+        # Per-language extractors, so each call is a single dict lookup
+        self._imports_extractors = {
+            'python': self._iter_imports_python,
+            'javascript': self._iter_imports_js,
+            'typescript': self._iter_imports_js,
+            'java': self._iter_imports_java,
+            'solidity': self._iter_imports_solidity
+        }
+        self._classes_extractors = {
+            'python': self._iter_classes_python,
+            'javascript': self._iter_classes_js,
+            'typescript': self._iter_classes_js,
+            'java': self._iter_classes_java,
+            'solidity': self._iter_classes_solidity
+        }
+        self._functions_extractors = {
+            'python': self._iter_functions_python,
+            'javascript': self._iter_functions_js,
+            'typescript': self._iter_functions_js,
+            'solidity': self._iter_functions_solidity
+        }
+        self._variables_extractors = {
+            'python': self._iter_variables_python,
+            'javascript': self._iter_variables_js,
+            'typescript': self._iter_variables_js,
+            'java': self._iter_variables_java,
+            'solidity': self._iter_variables_solidity
+        }
+        self._function_locators = {
+            'python': self._find_function_location_python,
+            'javascript': self._find_function_location_js,
+            'typescript': self._find_function_location_js,
+            'java': self._find_function_location_java
+        }
     
     def get_language_from_file(self, file_path: str) -> Optional[str]:
         """
@@ -49,8 +437,11 @@ class CodeParser:
         Returns:
             Language name or None if unknown
         """
-        _, ext = os.path.splitext(file_path.lower())
-        return self.extension_to_language.get(ext)
+        # Only the extension is lowercased; a leading dot names a hidden file, not an extension
+        dot = file_path.rfind('.')
+        if dot <= 0 or file_path[dot - 1] in (os.sep, os.altsep):
+            return None
+        return self.extension_to_language.get(file_path[dot:].lower())
     
     async def parse_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -62,35 +453,141 @@ class CodeParser:
         Returns:
             File structure information
         """
-        full_path = self.repo_path / file_path
+        return await asyncio.to_thread(self._parse_path, file_path)
+    
+    def parse_files(self, file_paths: List[str], workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse many files in parallel across worker processes.
+        
+        Args:
+            file_paths: Paths to the files, relative to the repository
+            workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Mapping of file path to file structure information
+        """
+        if not file_paths:
+            return {}
+        
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            results = executor.map(
+                _parse_worker,
+                [(self.repo_path, file_path) for file_path in file_paths],
+                chunksize=_PARSE_CHUNKSIZE
+            )
+            return dict(zip(file_paths, results))
+    
+    def _parse_path(self, file_path: str) -> Dict[str, Any]:
+        """
+        Parse a file and extract its structure, blocking on the read.
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            File structure information
+        """
+        # Joined as a string: building a Path per file costs more than the stat itself
+        full_path = os.path.join(self._repo_str, file_path)
         
-        if not full_path.exists():
+        # One stat serves the existence check, the size limit and the cache key
+        try:
+            stat = os.stat(full_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
         
+        cache_key = (file_path, stat.st_mtime_ns, stat.st_size)
+        cached = self._parse_cache.get(cache_key)
+        if cached is not None:
+            self._parse_cache.move_to_end(cache_key)
+            return cached
+        
         # Skip large files
-        if full_path.stat().st_size > 1_000_000:  # 1MB
+        if stat.st_size > 1_000_000:  # 1MB
             return {'error': 'File too large to parse'}
         
+        # Read the whole file in one call and decode it in one pass, skipping the text-mode wrapper
+        with open(full_path, 'rb') as f:
+            data = f.read()
         try:
-            content = full_path.read_text(encoding='utf-8')
+            content = data.decode('utf-8')
         except UnicodeDecodeError:
             return {'error': 'Unable to decode file as text'}
         
+        # Match text mode's universal newlines so line-anchored patterns behave the same
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
+        result = self.parse_content(file_path, content)
+        if 'error' in result:
+            return result
+        
+        self._parse_cache[cache_key] = result
+        if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        
+        return result
+    
+    def parse_content(self, file_path: str, content: str) -> Dict[str, Any]:
+        """
+        Extract the structure of a file whose content has already been read.
+        
+        Args:
+            file_path: Path to the file, used to determine its language
+            content: Content of the file, with newlines normalized to '\\n'
+            
+        Returns:
+            File structure information
+        """
         language = self.get_language_from_file(file_path)
         if not language:
             return {'error': 'Unsupported file type'}
         
-        result = {
+        kinds = self._symbol_kinds_present(content, language)
+        
+        def wanted(kind: str) -> bool:
+            return kinds is None or kind in kinds
+        
+        return {
             'language': language,
-            'imports': await self.extract_imports(content, language),
-            'classes': await self.extract_classes(content, language),
-            'functions': await self.extract_functions(content, language),
-            'variables': await self.extract_variables(content, language)
+            'imports': self.extract_imports(content, language) if wanted('imports') else [],
+            'classes': self.extract_classes(content, language) if wanted('classes') else [],
+            'functions': self.extract_functions(content, language) if wanted('functions') else [],
+            'variables': self.extract_variables(content, language) if wanted('variables') else []
         }
+    
+    def _symbol_kinds_present(self, content: str, language: str) -> Optional[Set[str]]:
+        """
+        Find which kinds of symbol a file can contain with a single Hyperscan pass over all its patterns.
         
-        return result
+        Args:
+            content: Source code
+            language: Programming language
+            
+        Returns:
+            Set of kinds ('imports', 'classes', ...) with at least one match, or None if Hyperscan is unavailable
+        """
+        compiled = _hyperscan_database(language)
+        if compiled is None:
+            return None
+        
+        database, kinds = compiled
+        scratches = getattr(self._hyperscan_local, 'scratches', None)
+        if scratches is None:
+            scratches = self._hyperscan_local.scratches = {}
+        scratch = scratches.get(language)
+        if scratch is None:
+            scratch = scratches[language] = hyperscan.Scratch(database)
+        
+        found = set()
+        
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            found.add(kinds[pattern_id])
+        
+        database.scan(content.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+        return found
     
-    async def extract_imports(self, content: str, language: str) -> List[Dict[str, Any]]:
+    def extract_imports(self, content: str, language: str) -> List[ImportInfo]:
         """
         Extract import statements from code.
         
@@ -101,586 +598,778 @@ class CodeParser:
         Returns:
             List of import information
         """
-        imports = []
+        extractor = self._imports_extractors.get(language)
+        return list(extractor(content)) if extractor else []
+    
+    def extract_classes(self, content: str, language: str) -> List[ClassInfo]:
+        """
+        Extract class definitions from code.
         
-        if language == 'python':
-            # Python imports
-            import_patterns = [
-                (r'^\s*import\s+([\w.]+)(?:\s+as\s+(\w+))?', lambda m: {'module': m.group(1), 'alias': m.group(2) or None}),
-                (r'^\s*from\s+([\w.]+)\s+import\s+([\w.*,\s]+)', lambda m: {'module': m.group(1), 'symbols': [s.strip() for s in m.group(2).split(',')]})
-            ]
-            
-            for pattern, parser in import_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    imports.append(parser(match))
-        
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript imports
-            import_patterns = [
-                (r'import\s+{([^}]+)}\s+from\s+[\'"]([^\'"]+)[\'"]', 
-                 lambda m: {'module': m.group(2), 'symbols': [s.strip() for s in m.group(1).split(',')]}),
-                (r'import\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]', 
-                 lambda m: {'module': m.group(2), 'default': m.group(1)}),
-                (r'import\s+\*\s+as\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]', 
-                 lambda m: {'module': m.group(2), 'namespace': m.group(1)}),
-                (r'(?:const|let|var)\s+{([^}]+)}\s+=\s+require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', 
-                 lambda m: {'module': m.group(2), 'symbols': [s.strip() for s in m.group(1).split(',')]}),
-                (r'(?:const|let|var)\s+(\w+)\s+=\s+require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)', 
-                 lambda m: {'module': m.group(2), 'default': m.group(1)})
-            ]
+        Args:
+            content: Source code
+            language: Programming language
             
-            for pattern, parser in import_patterns:
-                for match in re.finditer(pattern, content):
-                    imports.append(parser(match))
+        Returns:
+            List of class information
+        """
+        extractor = self._classes_extractors.get(language)
+        return list(extractor(content)) if extractor else []
+    
+    def extract_functions(self, content: str, language: str) -> List[FunctionInfo]:
+        """
+        Extract function definitions from code.
         
-        elif language == 'java':
-            # Java imports
-            import_pattern = r'^\s*import\s+(static\s+)?([\w.]+)(?:\.\*)?;'
+        Args:
+            content: Source code
+            language: Programming language
             
-            for match in re.finditer(import_pattern, content, re.MULTILINE):
-                imports.append({
-                    'static': bool(match.group(1)),
-                    'package': match.group(2)
-                })
+        Returns:
+            List of function information
+        """
+        extractor = self._functions_extractors.get(language)
+        return list(extractor(content)) if extractor else []
+    
+    def extract_variables(self, content: str, language: str) -> List[VariableInfo]:
+        """
+        Extract global/important variable definitions from code.
         
-        elif language == 'solidity':
-            # Solidity imports
-            import_pattern = r'import\s+[\'"]([^\'"]+)[\'"]\s*;'
-            
-            for match in re.finditer(import_pattern, content):
-                imports.append({
-                    'path': match.group(1)
-                })
+        Args:
+            content: Source code
+            language: Programming language
             
-            # Also detect inheritance imports
-            inherit_pattern = r'is\s+([\w,\s]+){'
-            for match in re.finditer(inherit_pattern, content):
-                contracts = [c.strip() for c in match.group(1).split(',')]
-                for contract in contracts:
-                    imports.append({
-                        'contract': contract
-                    })
-        
-        return imports
+        Returns:
+            List of variable information
+        """
+        extractor = self._variables_extractors.get(language)
+        return list(extractor(content)) if extractor else []
     
-    async def extract_classes(self, content: str, language: str) -> List[Dict[str, Any]]:
+    def find_function_location(self, content: str, function_name: str, language: str) -> Optional[Tuple[int, int]]:
         """
-        Extract class definitions from code.
+        Find the start and end location of a function in the code.
         
         Args:
             content: Source code
+            function_name: Name of the function to find
             language: Programming language
             
         Returns:
-            List of class information
+            Tuple of (start, end) positions or None if not found
+        """
+        locator = self._function_locators.get(language)
+        return locator(content, function_name) if locator else None
+    
+    async def find_class_by_name(self, file_path: str, class_name: str) -> Optional[ClassInfo]:
         """
-        classes = []
+        Find a class by name in a file.
         
-        if language == 'python':
-            # Python classes
-            class_pattern = r'^\s*class\s+(\w+)(?:\(([^)]*)\))?:'
+        Args:
+            file_path: Path to the file
+            class_name: Name of the class to find
             
-            for match in re.finditer(class_pattern, content, re.MULTILINE):
-                class_name = match.group(1)
-                parent_classes = []
-                
-                if match.group(2):
-                    parent_classes = [p.strip() for p in match.group(2).split(',')]
-                
-                # Find class methods
-                class_start = match.end()
-                class_indent = None
-                methods = []
-                
-                # Get the line where the class is defined
-                class_line_end = content.find('\n', match.start())
-                if class_line_end == -1:
-                    class_line_end = len(content)
-                
-                # Find the next line's indentation to determine class body
-                next_line_match = re.search(r'^\s+', content[class_line_end+1:], re.MULTILINE)
-                if next_line_match:
-                    class_indent = next_line_match.group(0)
-                    
-                    # Extract methods using this indentation as a guide
-                    method_pattern = re.compile(r'^' + class_indent + r'def\s+(\w+)\s*\(([^)]*)\):', re.MULTILINE)
+        Returns:
+            Class information or None if not found
+        """
+        try:
+            parsed_file = await self.parse_file(file_path)
+            
+            for cls in parsed_file.get('classes', []):
+                if cls.name == class_name:
+                    return cls
                     
-                    for method_match in method_pattern.finditer(content[class_line_end:]):
-                        method_name = method_match.group(1)
-                        params = method_match.group(2).strip()
-                        
-                        # Remove 'self' from params
-                        if params.startswith('self'):
-                            params = params[4:].strip()
-                            if params.startswith(','):
-                                params = params[1:].strip()
-                        
-                        methods.append({
-                            'name': method_name,
-                            'params': params
-                        })
-                
-                classes.append({
-                    'name': class_name,
-                    'parent_classes': parent_classes,
-                    'methods': methods
-                })
-        
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript classes
-            class_pattern = r'^\s*class\s+(\w+)(?:\s+extends\s+(\w+))?'
-            
-            for match in re.finditer(class_pattern, content, re.MULTILINE):
-                class_name = match.group(1)
-                parent_class = match.group(2)
-                
-                # Find the opening brace
-                class_start = match.end()
-                brace_index = content.find('{', class_start)
-                
-                if brace_index != -1:
-                    # Find methods in class body
-                    class_body = content[brace_index:]
-                    methods = []
+            return None
+        except Exception:
+            return None
+    
+    async def find_function_by_name(self, file_path: str, function_name: str) -> Optional[Union[FunctionInfo, MethodInfo]]:
+        """
+        Find a function by name in a file.
+        
+        Args:
+            file_path: Path to the file
+            function_name: Name of the function to find
+            
+        Returns:
+            Function information or None if not found
+        """
+        try:
+            parsed_file = await self.parse_file(file_path)
+            
+            for func in parsed_file.get('functions', []):
+                if func.name == function_name:
+                    return func
                     
-                    # Method pattern (including constructor)
-                    method_patterns = [
-                        r'(?:async\s+)?(?:constructor|[\w]+)\s*\(([^)]*)\)',
-                        r'(?:async\s+)?(?:get|set)\s+([\w]+)\s*\(([^)]*)\)',
-                        r'(?:static\s+)?(?:async\s+)?([\w]+)\s*\(([^)]*)\)'
-                    ]
+            # Also check class methods
+            for cls in parsed_file.get('classes', []):
+                for method in cls.methods or []:
+                    if method.name == function_name:
+                        return method._replace(class_name=cls.name)
                     
-                    # Find the closing brace of the class
-                    nest_level = 1
-                    class_end = brace_index + 1
-                    for i in range(1, len(class_body)):
-                        if class_body[i] == '{':
-                            nest_level += 1
-                        elif class_body[i] == '}':
-                            nest_level -= 1
-                            if nest_level == 0:
-                                class_end = brace_index + i + 1
-                                class_body = class_body[:i]
-                                break
+            return None
+        except Exception:
+            return None
+    
+    def _iter_imports_python(self, content: str) -> Iterator[ImportInfo]:
+        """
+        Extract import statements from Python code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Import information
+        """
+        # Cheap substring check skips parsing for files without imports
+        if 'import' not in content:
+            return
+        
+        tree = _parse_python(content)
+        if tree is None:
+            yield from self._iter_imports_python_by_regex(content)
+            return
+        
+        nodes = [node for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))]
+        nodes.sort(key=lambda node: (node.lineno, node.col_offset))
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    yield ImportInfo(module=alias.name, alias=alias.asname)
+            else:
+                yield ImportInfo(
+                    module='.' * node.level + (node.module or ''),
+                    symbols=[f'{alias.name} as {alias.asname}' if alias.asname else alias.name for alias in node.names]
+                )
+    
+    def _iter_classes_python(self, content: str) -> Iterator[ClassInfo]:
+        """
+        Extract class definitions from Python code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Class information
+        """
+        if 'class' not in content:
+            return
+        
+        tree = _parse_python(content)
+        if tree is None:
+            yield from self._iter_classes_python_by_regex(content)
+            return
+        
+        nodes = [node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
+        nodes.sort(key=lambda node: (node.lineno, node.col_offset))
+        for node in nodes:
+            parent_classes = [ast.unparse(base) for base in node.bases]
+            parent_classes.extend(f'{keyword.arg}={ast.unparse(keyword.value)}' for keyword in node.keywords)
+            
+            methods = []
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    params = ast.unparse(item.args)
                     
-                    for pattern in method_patterns:
-                        for method_match in re.finditer(pattern, class_body):
-                            if len(method_match.groups()) == 1:
-                                # Constructor
-                                methods.append({
-                                    'name': 'constructor',
-                                    'params': method_match.group(1).strip()
-                                })
-                            else:
-                                # Regular method
-                                method_name = method_match.group(1)
-                                params = method_match.group(2).strip() if len(method_match.groups()) > 1 else ''
-                                
-                                methods.append({
-                                    'name': method_name,
-                                    'params': params
-                                })
+                    # Remove 'self' from params
+                    if params.startswith('self'):
+                        params = params[4:].strip()
+                        if params.startswith(','):
+                            params = params[1:].strip()
                     
-                    classes.append({
-                        'name': class_name,
-                        'parent_classes': [parent_class] if parent_class else [],
-                        'methods': methods
-                    })
-            
-            # Also detect React components
-            component_patterns = [
-                (r'^\s*(?:export\s+)?(?:default\s+)?function\s+(\w+)\s*\(([^)]*)\)', 
-                 lambda m: {'name': m.group(1), 'type': 'function_component', 'props': m.group(2).strip()}),
-                (r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:React\.)?(?:memo\()?(?:forwardRef\()?(?:\([^)]*\)|[^=]+)=>', 
-                 lambda m: {'name': m.group(1), 'type': 'arrow_component'})
-            ]
+                    methods.append(MethodInfo(
+                        name=item.name,
+                        params=params
+                    ))
             
-            for pattern, parser in component_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    component_info = parser(match)
-                    if component_info['name'][0].isupper():  # React components conventionally start with uppercase
-                        classes.append(component_info)
+            yield ClassInfo(
+                name=node.name,
+                parent_classes=parent_classes,
+                methods=methods
+            )
+    
+    def _iter_functions_python(self, content: str) -> Iterator[FunctionInfo]:
+        """
+        Extract function definitions from Python code.
         
-        elif language == 'java':
-            # Java classes
-            class_pattern = r'(?:public|protected|private)?\s*(?:abstract|final)?\s*class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?'
+        Args:
+            content: Source code
             
-            for match in re.finditer(class_pattern, content):
-                class_name = match.group(1)
-                parent_class = match.group(2)
-                interfaces = []
-                
-                if match.group(3):
-                    interfaces = [i.strip() for i in match.group(3).split(',')]
-                
-                classes.append({
-                    'name': class_name,
-                    'parent_class': parent_class,
-                    'interfaces': interfaces
-                })
-        
-        elif language == 'solidity':
-            # Solidity contracts are similar to classes
-            contract_pattern = r'(?:contract|library|interface)\s+(\w+)(?:\s+is\s+([\w\s,]+))?\s*{'
-            
-            for match in re.finditer(contract_pattern, content):
-                contract_name = match.group(1)
-                parent_contracts = []
-                
-                if match.group(2):
-                    parent_contracts = [c.strip() for c in match.group(2).split(',')]
+        Yields:
+            Function information
+        """
+        if 'def' not in content:
+            return
+        
+        tree = _parse_python(content)
+        if tree is None:
+            yield from self._iter_functions_python_by_regex(content)
+            return
+        
+        # Python functions (excluding class methods)
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                yield FunctionInfo(
+                    name=node.name,
+                    params=ast.unparse(node.args),
+                    return_type=ast.unparse(node.returns) if node.returns else None
+                )
+    
+    def _iter_variables_python(self, content: str) -> Iterator[VariableInfo]:
+        """
+        Extract global/important variable definitions from Python code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Variable information
+        """
+        tree = _parse_python(content)
+        if tree is None:
+            yield from self._iter_variables_python_by_regex(content)
+            return
+        
+        # Python global variables (simplified, assumes constants are UPPERCASE)
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                target = node.targets[0]
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                target = node.target
+            else:
+                continue
+            
+            if isinstance(target, ast.Name) and _PY_CONSTANT_NAME_RE.fullmatch(target.id):
+                yield VariableInfo(
+                    name=target.id,
+                    value=ast.get_source_segment(content, node.value),
+                    type='constant'
+                )
+    
+    def _iter_imports_python_by_regex(self, content: str) -> Iterator[ImportInfo]:
+        """
+        Extract import statements from Python code with regexes, for files that don't parse as Python 3.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Import information
+        """
+        # Python imports
+        yield from _scan_fused(_PY_IMPORT_RE, _PY_IMPORT_PARSERS, content)
+    
+    def _iter_imports_js(self, content: str) -> Iterator[ImportInfo]:
+        """
+        Extract import statements from JavaScript/TypeScript code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Import information
+        """
+        if 'import' not in content and 'require' not in content:
+            return
+        
+        # JavaScript/TypeScript imports
+        yield from _scan_fused(_JS_IMPORT_RE, _JS_IMPORT_PARSERS, content)
+    
+    def _iter_imports_java(self, content: str) -> Iterator[ImportInfo]:
+        """
+        Extract import statements from Java code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Import information
+        """
+        if 'import' not in content:
+            return
+        
+        # Java imports
+        for match in _JAVA_IMPORT_RE.finditer(content):
+            yield ImportInfo(
+                static=bool(match.group(1)),
+                package=match.group(2)
+            )
+    
+    def _iter_imports_solidity(self, content: str) -> Iterator[ImportInfo]:
+        """
+        Extract import statements from Solidity code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Import information
+        """
+        # Solidity imports
+        import_matches = _SOL_IMPORT_RE.finditer(content) if 'import' in content else ()
+        for match in import_matches:
+            yield ImportInfo(
+                path=match.group(1)
+            )
+        
+        # Also detect inheritance imports
+        for match in _SOL_INHERIT_RE.finditer(content):
+            contracts = _CSV_RE.split(match.group(1).strip())
+            for contract in contracts:
+                yield ImportInfo(
+                    contract=contract
+                )
+    
+    def _iter_classes_python_by_regex(self, content: str) -> Iterator[ClassInfo]:
+        """
+        Extract class definitions from Python code with regexes, for files that don't parse as Python 3.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Class information
+        """
+        # Python classes
+        for match in _PY_CLASS_RE.finditer(content):
+            class_name = match.group(1)
+            parent_classes = []
+            
+            if match.group(2):
+                parent_classes = _CSV_RE.split(match.group(2).strip())
+            
+            # Find class methods
+            class_start = match.end()
+            class_indent = None
+            methods = []
+            
+            # Get the line where the class is defined
+            class_line_end = content.find('\n', match.start())
+            if class_line_end == -1:
+                class_line_end = len(content)
+            
+            # Find the next line's indentation to determine class body
+            next_line_match = _PY_INDENT_RE.search(content, class_line_end + 1)
+            if next_line_match:
+                class_indent = next_line_match.group(0)
                 
-                # Find functions in the contract
-                contract_start = match.end()
-                contract_end = find_closing_brace(content, contract_start)
-                contract_body = content[contract_start:contract_end]
+                # Extract methods using this indentation as a guide
+                method_pattern = _py_method_pattern(class_indent)
                 
-                methods = []
-                function_pattern = r'function\s+(\w+)\s*\(([^)]*)\)'
-                for func_match in re.finditer(function_pattern, contract_body):
-                    method_name = func_match.group(1)
-                    params = func_match.group(2).strip()
+                for method_match in method_pattern.finditer(content, class_line_end):
+                    method_name = method_match.group(1)
+                    params = method_match.group(2).strip()
                     
-                    methods.append({
-                        'name': method_name,
-                        'params': params
-                    })
+                    # Remove 'self' from params
+                    if params.startswith('self'):
+                        params = params[4:].strip()
+                        if params.startswith(','):
+                            params = params[1:].strip()
+                    
+                    methods.append(MethodInfo(
+                        name=method_name,
+                        params=params
+                    ))
+            
+            yield ClassInfo(
+                name=class_name,
+                parent_classes=parent_classes,
+                methods=methods
+            )
+    
+    def _iter_classes_js(self, content: str) -> Iterator[ClassInfo]:
+        """
+        Extract class definitions from JavaScript/TypeScript code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Class information
+        """
+        # JavaScript/TypeScript classes
+        class_matches = _JS_CLASS_RE.finditer(content) if 'class' in content else ()
+        for match in class_matches:
+            class_name = match.group(1)
+            parent_class = match.group(2)
+            
+            # Find the opening brace
+            class_start = match.end()
+            brace_index = content.find('{', class_start)
+            
+            if brace_index != -1:
+                # Find methods in class body, up to the closing brace of the class
+                class_end = _find_closing_brace(content, brace_index + 1)
+                class_body = content[brace_index:class_end]
+                methods = []
+                
+                for pattern in _JS_METHOD_RES:
+                    for method_match in pattern.finditer(class_body):
+                        if len(method_match.groups()) == 1:
+                            # Constructor
+                            methods.append(MethodInfo(
+                                name='constructor',
+                                params=method_match.group(1).strip()
+                            ))
+                        else:
+                            # Regular method
+                            method_name = method_match.group(1)
+                            params = method_match.group(2).strip() if len(method_match.groups()) > 1 else ''
+                            
+                            methods.append(MethodInfo(
+                                name=method_name,
+                                params=params
+                            ))
                 
-                classes.append({
-                    'name': contract_name,
-                    'type': 'contract',
-                    'parent_contracts': parent_contracts,
-                    'methods': methods
-                })
+                yield ClassInfo(
+                    name=class_name,
+                    parent_classes=[parent_class] if parent_class else [],
+                    methods=methods
+                )
+        
+        # Also detect React components
+        if 'function' not in content and '=>' not in content:
+            return
+        
+        for pattern, parser in _JS_COMPONENT_PATTERNS:
+            for match in pattern.finditer(content):
+                # React components conventionally start with uppercase; check before building the record
+                if match.group(1)[0].isupper():
+                    yield parser(match)
+    
+    def _iter_classes_java(self, content: str) -> Iterator[ClassInfo]:
+        """
+        Extract class definitions from Java code.
+        
+        Args:
+            content: Source code
+            
+        Yields:
+            Class information
+        """
+        if 'class' not in content:
+            return
+        
+        # Java classes
+        for match in _JAVA_CLASS_RE.finditer(content):
+            class_name = match.group(1)
+            parent_class = match.group(2)
+            interfaces = []
             
-        return classes
+            if match.group(3):
+                interfaces = _CSV_RE.split(match.group(3).strip())
+            
+            yield ClassInfo(
+                name=class_name,
+                parent_class=parent_class,
+                interfaces=interfaces
+            )
     
-    async def extract_functions(self, content: str, language: str) -> List[Dict[str, Any]]:
+    def _iter_classes_solidity(self, content: str) -> Iterator[ClassInfo]:
         """
-        Extract function definitions from code.
+        Extract class definitions from Solidity code.
         
         Args:
             content: Source code
-            language: Programming language
             
-        Returns:
-            List of function information
+        Yields:
+            Class information
         """
-        functions = []
+        if 'contract' not in content and 'library' not in content and 'interface' not in content:
+            return
         
-        if language == 'python':
-            # Python functions (excluding class methods)
-            function_pattern = r'^\s*def\s+(\w+)\s*\(([^)]*)\)(?:\s*->\s*([^:]+))?:'
+        # Solidity contracts are similar to classes
+        for match in _SOL_CONTRACT_RE.finditer(content):
+            contract_name = match.group(1)
+            parent_contracts = []
+            
+            if match.group(2):
+                parent_contracts = _CSV_RE.split(match.group(2).strip())
             
-            for match in re.finditer(function_pattern, content, re.MULTILINE):
-                # Check if this is a method by looking at indentation
-                line_start = content.rfind('\n', 0, match.start()) + 1
-                indent = match.start() - line_start
+            # Find functions in the contract
+            contract_start = match.end()
+            contract_end = _find_closing_brace(content, contract_start)
+            contract_body = content[contract_start:contract_end]
+            
+            methods = []
+            for func_match in _SOL_METHOD_RE.finditer(contract_body):
+                method_name = func_match.group(1)
+                params = func_match.group(2).strip()
                 
-                # If indentation is 0, it's a top-level function
-                if indent == 0:
-                    function_name = match.group(1)
-                    params = match.group(2).strip()
-                    return_type = match.group(3).strip() if match.group(3) else None
-                    
-                    functions.append({
-                        'name': function_name,
-                        'params': params,
-                        'return_type': return_type
-                    })
-        
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript functions
-            function_patterns = [
-                (r'^\s*function\s+(\w+)\s*\(([^)]*)\)', 
-                 lambda m: {'name': m.group(1), 'params': m.group(2).strip(), 'type': 'declaration'}),
-                (r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s+(\w+)\s*\(([^)]*)\)', 
-                 lambda m: {'name': m.group(1), 'params': m.group(2).strip(), 'type': 'declaration', 'exported': True}),
-                (r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>', 
-                 lambda m: {'name': m.group(1), 'params': m.group(2).strip(), 'type': 'arrow', 'exported': True}),
-                (r'^\s*(?:let|var)\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>', 
-                 lambda m: {'name': m.group(1), 'params': m.group(2).strip(), 'type': 'arrow'}),
-                (r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:async\s*)?function\s*\(([^)]*)\)', 
-                 lambda m: {'name': m.group(1), 'params': m.group(2).strip(), 'type': 'expression', 'exported': True})
-            ]
+                methods.append(MethodInfo(
+                    name=method_name,
+                    params=params
+                ))
             
-            for pattern, parser in function_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    # Skip if this matches a React component (first letter uppercase)
-                    function_name = match.group(1)
-                    if not function_name[0].isupper():
-                        functions.append(parser(match))
-        
-        elif language == 'java':
-            # Java methods outside of classes are not valid, so we don't extract them
-            pass
+            yield ClassInfo(
+                name=contract_name,
+                type='contract',
+                parent_contracts=parent_contracts,
+                methods=methods
+            )
+    
+    def _iter_functions_python_by_regex(self, content: str) -> Iterator[FunctionInfo]:
+        """
+        Extract function definitions from Python code with regexes, for files that don't parse as Python 3.
         
-        elif language == 'solidity':
-            # Solidity functions
-            function_pattern = r'function\s+(\w+)\s*\(([^)]*)\)(?:\s+(?:external|public|internal|private))?\s*(?:(?:pure|view|payable))?\s*(?:returns\s*\([^)]*\))?\s*{'
+        Args:
+            content: Source code
+            
+        Yields:
+            Function information
+        """
+        # Python functions (excluding class methods)
+        for match in _PY_FUNCTION_RE.finditer(content):
+            # Check if this is a method by looking at indentation
+            line_start = content.rfind('\n', 0, match.start()) + 1
+            indent = match.start() - line_start
             
-            for match in re.finditer(function_pattern, content):
+            # If indentation is 0, it's a top-level function
+            if indent == 0:
                 function_name = match.group(1)
                 params = match.group(2).strip()
+                return_type = match.group(3).strip() if match.group(3) else None
                 
-                functions.append({
-                    'name': function_name,
-                    'params': params
-                })
-        
-        return functions
+                yield FunctionInfo(
+                    name=function_name,
+                    params=params,
+                    return_type=return_type
+                )
     
-    async def extract_variables(self, content: str, language: str) -> List[Dict[str, Any]]:
+    def _iter_functions_js(self, content: str) -> Iterator[FunctionInfo]:
         """
-        Extract global/important variable definitions from code.
+        Extract function definitions from JavaScript/TypeScript code.
         
         Args:
             content: Source code
-            language: Programming language
             
-        Returns:
-            List of variable information
+        Yields:
+            Function information
         """
-        variables = []
+        if 'function' not in content and '=>' not in content:
+            return
         
-        if language == 'python':
-            # Python global variables (simplified, assumes constants are UPPERCASE)
-            variable_pattern = r'^([A-Z][A-Z0-9_]*)\s*=\s*(.+?)$'
+        # JavaScript/TypeScript functions
+        for function_info in _scan_fused(_JS_FUNCTION_RE, _JS_FUNCTION_PARSERS, content):
+            # Skip if this matches a React component (first letter uppercase)
+            if not function_info.name[0].isupper():
+                yield function_info
+    
+    def _iter_functions_solidity(self, content: str) -> Iterator[FunctionInfo]:
+        """
+        Extract function definitions from Solidity code.
+        
+        Args:
+            content: Source code
             
-            for match in re.finditer(variable_pattern, content, re.MULTILINE):
-                var_name = match.group(1)
-                var_value = match.group(2).strip()
-                
-                variables.append({
-                    'name': var_name,
-                    'value': var_value,
-                    'type': 'constant'
-                })
-        
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript constants and important variables
-            variable_patterns = [
-                (r'^\s*(?:export\s+)?const\s+([A-Z][A-Z0-9_]*)\s*=\s*(.+?)$', 
-                 lambda m: {'name': m.group(1), 'value': m.group(2).strip(), 'type': 'constant'}),
-                (r'^\s*(?:export\s+)?const\s+(\w+)\s*=\s*(.+?)$', 
-                 lambda m: {'name': m.group(1), 'value': m.group(2).strip(), 'type': 'constant'}),
-                (r'^\s*(?:export\s+)?let\s+(\w+)\s*=\s*(.+?)$', 
-                 lambda m: {'name': m.group(1), 'value': m.group(2).strip(), 'type': 'variable'}),
-                (r'^\s*(?:export\s+)?var\s+(\w+)\s*=\s*(.+?)$', 
-                 lambda m: {'name': m.group(1), 'value': m.group(2).strip(), 'type': 'variable'})
-            ]
+        Yields:
+            Function information
+        """
+        if 'function' not in content:
+            return
+        
+        # Solidity functions
+        for match in _SOL_FUNCTION_RE.finditer(content):
+            function_name = match.group(1)
+            params = match.group(2).strip()
             
-            for pattern, parser in variable_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    variables.append(parser(match))
+            yield FunctionInfo(
+                name=function_name,
+                params=params
+            )
+    
+    def _iter_variables_python_by_regex(self, content: str) -> Iterator[VariableInfo]:
+        """
+        Extract global/important variable definitions from Python code with regexes, for files that don't parse as Python 3.
         
-        elif language == 'java':
-            # Java constants and fields (simplified)
-            variable_pattern = r'^\s*(?:public|private|protected)?\s*(?:static\s+final|final\s+static)?\s+(\w+)\s+([A-Z][A-Z0-9_]*)\s*=\s*(.+?);'
+        Args:
+            content: Source code
             
-            for match in re.finditer(variable_pattern, content, re.MULTILINE):
-                var_type = match.group(1)
-                var_name = match.group(2)
-                var_value = match.group(3).strip()
-                
-                variables.append({
-                    'name': var_name,
-                    'type': 'constant',
-                    'data_type': var_type,
-                    'value': var_value
-                })
-        
-        elif language == 'solidity':
-            # Solidity state variables
-            variable_pattern = r'(uint|int|bool|address|string|bytes\d*)\s+(public|private|internal)?\s*(\w+)\s*(?:=\s*([^;]+))?;'
-            
-            for match in re.finditer(variable_pattern, content):
-                var_type = match.group(1)
-                visibility = match.group(2) or 'internal'  # Default to internal if not specified
-                var_name = match.group(3)
-                var_value = match.group(4)
-                
-                variables.append({
-                    'name': var_name,
-                    'type': var_type,
-                    'visibility': visibility,
-                    'value': var_value
-                })
+        Yields:
+            Variable information
+        """
+        # Python global variables (simplified, assumes constants are UPPERCASE)
+        for match in _PY_VARIABLE_RE.finditer(content):
+            var_name = match.group(1)
+            var_value = match.group(2).strip()
             
-        return variables
+            yield VariableInfo(
+                name=var_name,
+                value=var_value,
+                type='constant'
+            )
     
-    async def find_function_location(self, content: str, function_name: str, language: str) -> Optional[Tuple[int, int]]:
+    def _iter_variables_js(self, content: str) -> Iterator[VariableInfo]:
         """
-        Find the start and end location of a function in the code.
+        Extract global/important variable definitions from JavaScript/TypeScript code.
         
         Args:
             content: Source code
-            function_name: Name of the function to find
-            language: Programming language
             
-        Returns:
-            Tuple of (start, end) positions or None if not found
+        Yields:
+            Variable information
         """
-        if language == 'python':
-            # Python function
-            pattern = rf'def\s+{function_name}\s*\([^)]*\)(?:\s*->.*?)?:'
-            match = re.search(pattern, content)
-            
-            if not match:
-                return None
-            
-            start = match.start()
-            
-            # Find the end of the function by tracking indentation
-            lines = content[match.end():].split('\n')
-            
-            # Get the indentation of the function body
-            if not lines:
-                return start, len(content)
-            
-            # Find first non-empty line to get indentation
-            body_indent = None
-            for line in lines:
-                stripped = line.lstrip()
-                if stripped:
-                    body_indent = len(line) - len(stripped)
-                    break
-            
-            if body_indent is None:
-                return start, len(content)
-            
-            # Find the first line with same or less indentation
-            end = match.end()
-            for i, line in enumerate(lines):
-                stripped = line.lstrip()
-                if stripped and (len(line) - len(stripped)) <= body_indent:
-                    end += sum(len(l) + 1 for l in lines[:i])
-                    break
-                end += len(line) + 1
-            
-            return start, end
-        
-        elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript function
-            patterns = [
-                rf'function\s+{function_name}\s*\([^)]*\)\s*{{',
-                rf'const\s+{function_name}\s*=\s*(?:async\s*)?\([^)]*\)\s*=>\s*{{',
-                rf'const\s+{function_name}\s*=\s*function\s*\([^)]*\)\s*{{'
-            ]
+        if 'const' not in content and 'let' not in content and 'var' not in content:
+            return
+        
+        # JavaScript/TypeScript constants and important variables
+        yield from _scan_fused(_JS_VARIABLE_RE, _JS_VARIABLE_PARSERS, content)
+    
+    def _iter_variables_java(self, content: str) -> Iterator[VariableInfo]:
+        """
+        Extract global/important variable definitions from Java code.
+        
+        Args:
+            content: Source code
             
-            for pattern in patterns:
-                match = re.search(pattern, content)
-                if match:
-                    start = match.start()
-                    
-                    # Find the opening brace
-                    opening_brace = content.find('{', start)
-                    if opening_brace == -1:
-                        return None
-                    
-                    # Find the matching closing brace
-                    nest_level = 1
-                    for i in range(opening_brace + 1, len(content)):
-                        if content[i] == '{':
-                            nest_level += 1
-                        elif content[i] == '}':
-                            nest_level -= 1
-                            if nest_level == 0:
-                                return start, i + 1
-                    
-                    return start, len(content)
+        Yields:
+            Variable information
+        """
+        # Java constants and fields (simplified)
+        for match in _JAVA_VARIABLE_RE.finditer(content):
+            var_type = match.group(1)
+            var_name = match.group(2)
+            var_value = match.group(3).strip()
             
-            return None
+            yield VariableInfo(
+                name=var_name,
+                type='constant',
+                data_type=var_type,
+                value=var_value
+            )
+    
+    def _iter_variables_solidity(self, content: str) -> Iterator[VariableInfo]:
+        """
+        Extract global/important variable definitions from Solidity code.
         
-        elif language == 'java':
-            # Java method
-            pattern = rf'(?:public|private|protected)?\s*(?:static\s+)?\w+\s+{function_name}\s*\([^)]*\)'
-            match = re.search(pattern, content)
+        Args:
+            content: Source code
             
-            if not match:
-                return None
-                
-            start = match.start()
+        Yields:
+            Variable information
+        """
+        # Solidity state variables
+        for match in _SOL_VARIABLE_RE.finditer(content):
+            var_type = match.group(1)
+            visibility = match.group(2) or 'internal'  # Default to internal if not specified
+            var_name = match.group(3)
+            var_value = match.group(4)
             
-            # Find opening brace
-            opening_brace = content.find('{', start)
-            if opening_brace == -1:
-                return None
-                
-            # Find matching closing brace
-            nest_level = 1
-            for i in range(opening_brace + 1, len(content)):
-                if content[i] == '{':
-                    nest_level += 1
-                elif content[i] == '}':
-                    nest_level -= 1
-                    if nest_level == 0:
-                        return start, i + 1
+            yield VariableInfo(
+                name=var_name,
+                type=var_type,
+                visibility=visibility,
+                value=var_value
+            )
+    
+    def _find_function_location_python(self, content: str, function_name: str) -> Optional[Tuple[int, int]]:
+        """
+        Find the start and end location of a Python function.
+        
+        Args:
+            content: Source code
+            function_name: Name of the function to find
             
+        Returns:
+            Tuple of (start, end) positions or None if not found
+        """
+        # Python function
+        match = _function_location_patterns('python', function_name)[0].search(content)
+        
+        if not match:
+            return None
+        
+        start = match.start()
+        
+        # A body on the same line as the def ends with that line
+        line_end = content.find('\n', match.end())
+        if line_end == -1:
             return start, len(content)
+        if content[match.end():line_end].strip():
+            return start, line_end
         
-        return None
+        # The first non-blank line sets the body indentation
+        body_match = _PY_BODY_LINE_RE.search(content, line_end)
+        if not body_match:
+            return start, len(content)
+        
+        # The function ends at the first later non-blank line indented less than its body
+        end_match = _py_dedent_pattern(len(body_match.group(1))).search(content, body_match.end())
+        return start, end_match.start() if end_match else len(content)
     
-    async def find_class_by_name(self, file_path: str, class_name: str) -> Optional[Dict[str, Any]]:
+    def _find_function_location_js(self, content: str, function_name: str) -> Optional[Tuple[int, int]]:
         """
-        Find a class by name in a file.
+        Find the start and end location of a JavaScript/TypeScript function.
         
         Args:
-            file_path: Path to the file
-            class_name: Name of the class to find
+            content: Source code
+            function_name: Name of the function to find
             
         Returns:
-            Class information or None if not found
+            Tuple of (start, end) positions or None if not found
         """
-        try:
-            parsed_file = await self.parse_file(file_path)
-            
-            for cls in parsed_file.get('classes', []):
-                if cls['name'] == class_name:
-                    return cls
-                    
-            return None
-        except Exception:
-            return None
+        # JavaScript/TypeScript function
+        for pattern in _function_location_patterns('javascript', function_name):
+            match = pattern.search(content)
+            if match:
+                start = match.start()
+                
+                # Find the opening brace
+                opening_brace = content.find('{', start)
+                if opening_brace == -1:
+                    return None
+                
+                # Find the matching closing brace
+                closing_brace = _find_closing_brace(content, opening_brace + 1)
+                return start, min(closing_brace + 1, len(content))
+        
+        return None
     
-    async def find_function_by_name(self, file_path: str, function_name: str) -> Optional[Dict[str, Any]]:
+    def _find_function_location_java(self, content: str, function_name: str) -> Optional[Tuple[int, int]]:
         """
-        Find a function by name in a file.
+        Find the start and end location of a Java function.
         
         Args:
-            file_path: Path to the file
+            content: Source code
             function_name: Name of the function to find
             
         Returns:
-            Function information or None if not found
+            Tuple of (start, end) positions or None if not found
         """
-        try:
-            parsed_file = await self.parse_file(file_path)
-            
-            for func in parsed_file.get('functions', []):
-                if func['name'] == function_name:
-                    return func
-                    
-            # Also check class methods
-            for cls in parsed_file.get('classes', []):
-                for method in cls.get('methods', []):
-                    if method['name'] == function_name:
-                        method['class_name'] = cls['name']
-                        return method
-                    
+        # Java method
+        match = _function_location_patterns('java', function_name)[0].search(content)
+        
+        if not match:
             return None
-        except Exception:
+        
+        start = match.start()
+        
+        # Find opening brace
+        opening_brace = content.find('{', start)
+        if opening_brace == -1:
             return None
+        
+        # Find matching closing brace
+        closing_brace = _find_closing_brace(content, opening_brace + 1)
+        return start, min(closing_brace + 1, len(content))
+
 
+# One parser per worker process and repository, so its pattern caches survive across chunks
+_worker_parsers: Dict[Path, CodeParser] = {}
 
-    def find_closing_brace(content: str, start_index: int) -> int:
-        """Find the position of the closing brace that matches the opening brace."""
-        count = 1
-        for i in range(start_index, len(content)):
-            if content[i] == '{':
-                count += 1
-            elif content[i] == '}':
-                count -= 1
-                if count == 0:
-                    return i
-        return len(content)
+def _parse_worker(args: Tuple[Path, str]) -> Dict[str, Any]:
+    """
+    Parse a single file inside a parse_files worker process.
+    
+    Args:
+        args: Tuple of (repository path, file path)
+        
+    Returns:
+        File structure information, or an error dict if the file can't be read
+    """
+    repo_path, file_path = args
+    parser = _worker_parsers.get(repo_path)
+    if parser is None:
+        parser = _worker_parsers[repo_path] = CodeParser(repo_path)
+    
+    try:
+        return parser._parse_path(file_path)
+    except OSError as e:
+        return {'error': str(e)}
@@ -0,0 +1,242 @@
+"""
+Inverted index from lowercase word tokens to the files containing them, persisted across runs.
+"""
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path.home() / ".cache" / "neurocommit" / "keyword-index"
+
+# Bump when tokenization changes so stale on-disk indexes are rebuilt
+INDEX_VERSION = 1
+
+# Persisted indexes unused for this long are deleted; temporary checkouts never reuse theirs
+_MAX_INDEX_AGE_SECONDS = 14 * 24 * 60 * 60
+
+# Files read at once while indexing
+_MAX_CONCURRENT_READS = 32
+
+# Larger files are left out of the index, matching the project analyzer's size limit
+_MAX_INDEXED_FILE_SIZE = 1_000_000
+
+# Keywords are always longer than two characters, so shorter tokens are never looked up.
+# On bytes, \w is ASCII-only: [A-Za-z0-9_]
+_TOKEN_RE = re.compile(rb'\w{3,}')
+
+def _tokenize_file(file_path: Path) -> Counter:
+    """
+    Count the word tokens in a file.
+    
+    The file is memory-mapped and tokenized as bytes, so it is never decoded or held in memory
+    as a string. Tokens are runs of ASCII letters, digits and underscores: non-ASCII letters split
+    words (Müller yields the token ller), so keywords containing them never match. Files that
+    aren't valid UTF-8 are tokenized all the same.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Counter of lowercase tokens
+    """
+    tokens = Counter()
+    with open(file_path, 'rb') as f:
+        # Empty files can't be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return tokens
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            raw_counts = Counter(_TOKEN_RE.findall(mm))
+    
+    # Fold case once per distinct token rather than once per occurrence
+    for token, count in raw_counts.items():
+        tokens[token.lower().decode('ascii')] += count
+    return tokens
+
+class KeywordIndex:
+    def __init__(self, repo_path: Path, index_dir: Optional[Path] = None):
+        """
+        Initialize the keyword index.
+        
+        Args:
+            repo_path: Path to the repository
+            index_dir: Directory for the persisted index (such as DEFAULT_INDEX_DIR), or None to
+                keep it in memory only
+        """
+        self.repo_path = repo_path
+        self._index_path: Optional[Path] = None
+        if index_dir is not None:
+            repo_key = hashlib.blake2b(str(Path(repo_path).resolve()).encode('utf-8'), digest_size=16).hexdigest()
+            self._index_path = index_dir / f"{repo_key}.pickle"
+        
+        # Per-file (mtime_ns, size, token counts), used to re-tokenize only changed files
+        self._files: Dict[str, Tuple[int, int, Counter]] = self._load()
+        self._inverted: Optional[Dict[str, Dict[str, int]]] = None
+    
+    async def refresh(self, file_paths: Iterable[str]) -> None:
+        """
+        Bring the index up to date with a set of files, re-tokenizing only those that changed.
+        
+        Args:
+            file_paths: Paths of the files to index, relative to the repository
+        """
+        file_paths = list(file_paths)
+        wanted = set(file_paths)
+        changed = False
+        
+        for stale in [path for path in self._files if path not in wanted]:
+            changed = self._replace(stale, None) or changed
+        
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_READS)
+        
+        async def index_file(file_path: str) -> bool:
+            full_path = self.repo_path / file_path
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                return self._replace(file_path, None)
+            
+            # Don't read generated or vendored files that grew past the limit since analysis
+            if stat.st_size > _MAX_INDEXED_FILE_SIZE:
+                return self._replace(file_path, None)
+            
+            entry = self._files.get(file_path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                return False
+            
+            async with semaphore:
+                try:
+                    tokens = await asyncio.to_thread(_tokenize_file, full_path)
+                except (OSError, ValueError):
+                    # Skip files that can't be read
+                    return self._replace(file_path, None)
+            return self._replace(file_path, (stat.st_mtime_ns, stat.st_size, tokens))
+        
+        results = await asyncio.gather(*(index_file(file_path) for file_path in file_paths))
+        if changed or any(results):
+            self._save()
+    
+    def _replace(self, file_path: str, entry: Optional[Tuple[int, int, Counter]]) -> bool:
+        """
+        Replace a file's entry, patching the inverted index with its token counts if it is built.
+        
+        Args:
+            file_path: Path to the file
+            entry: New (mtime_ns, size, token counts), or None to remove the file
+            
+        Returns:
+            True if the index changed
+        """
+        old = self._files.pop(file_path, None) if entry is None else self._files.get(file_path)
+        if entry is not None:
+            self._files[file_path] = entry
+        if old is None and entry is None:
+            return False
+        
+        # Only the changed file's tokens are touched, rather than re-inverting every file
+        if self._inverted is not None:
+            if old is not None:
+                for token in old[2]:
+                    postings = self._inverted[token]
+                    del postings[file_path]
+                    if not postings:
+                        del self._inverted[token]
+            if entry is not None:
+                for token, count in entry[2].items():
+                    self._inverted.setdefault(token, {})[file_path] = count
+        return True
+    
+    def match_counts(self, keywords: List[str]) -> Dict[str, int]:
+        """
+        Count keyword occurrences per file.
+        
+        Args:
+            keywords: List of lowercase keywords
+            
+        Returns:
+            Dictionary mapping each file containing a keyword to its total number of occurrences
+        """
+        if self._inverted is None:
+            self._inverted = self._build_inverted()
+        
+        counts: Dict[str, int] = {}
+        for keyword in keywords:
+            for file_path, count in self._inverted.get(keyword, {}).items():
+                counts[file_path] = counts.get(file_path, 0) + count
+        return counts
+    
+    def _build_inverted(self) -> Dict[str, Dict[str, int]]:
+        """
+        Invert the per-file token counts into token -> {file path: count}.
+        
+        Returns:
+            Inverted index
+        """
+        inverted: Dict[str, Dict[str, int]] = {}
+        for file_path, (_, _, tokens) in self._files.items():
+            for token, count in tokens.items():
+                inverted.setdefault(token, {})[file_path] = count
+        return inverted
+    
+    def _load(self) -> Dict[str, Tuple[int, int, Counter]]:
+        """
+        Load the persisted per-file token counts.
+        
+        Returns:
+            Per-file entries, or an empty dictionary if there is no usable index on disk
+        """
+        if self._index_path is None or not self._index_path.exists():
+            return {}
+        
+        try:
+            with open(self._index_path, 'rb') as f:
+                version, files = pickle.load(f)
+            # Mark the index as used so eviction keeps it
+            os.utime(self._index_path)
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Could not read keyword index at {self._index_path}: {str(e)}")
+            return {}
+        
+        return files if version == INDEX_VERSION else {}
+    
+    def _save(self) -> None:
+        """
+        Persist the per-file token counts.
+        """
+        if self._index_path is None:
+            return
+        
+        try:
+            os.makedirs(self._index_path.parent, exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a truncated index behind
+            tmp_path = self._index_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((INDEX_VERSION, self._files), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            logger.warning(f"Could not write keyword index at {self._index_path}: {str(e)}")
+            return
+        
+        self._evict_stale()
+    
+    def _evict_stale(self) -> None:
+        """
+        Delete persisted indexes of any repository that haven't been used for _MAX_INDEX_AGE_SECONDS.
+        """
+        cutoff = time.time() - _MAX_INDEX_AGE_SECONDS
+        try:
+            with os.scandir(self._index_path.parent) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.pickle') and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+        except OSError as e:
+            logger.warning(f"Could not evict stale keyword indexes: {str(e)}")
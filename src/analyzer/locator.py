@@ -1,25 +1,113 @@
 """
 Locates where code changes should be made in a project.
 """
+import asyncio
+import heapq
 import os
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Set, Tuple
 
 from src.analyzer.code_parser import CodeParser
+from src.analyzer.keyword_index import KeywordIndex
+from src.analyzer.parse_cache import ParseCache
 from src.analyzer.project import ProjectAnalyzer
 
+# Keyword matches beyond this many add nothing to a file's score
+_MAX_KEYWORD_MATCHES = 10
+
+# Words too common to say anything about where a feature belongs
+_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'if', 'in', 'on', 'to', 'with',
+    'for', 'of', 'at', 'by', 'it', 'be', 'is', 'are', 'was', 'were',
+    'has', 'have', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
+    'can', 'could', 'may', 'might', 'feature', 'implement', 'add', 'create',
+    'update', 'change', 'modify'
+})
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Directories never searched for a place to put new files
+_IGNORED_DIRS = frozenset({'node_modules', 'venv', '__pycache__', 'dist', 'build', 'target'})
+
+# Words in camelCase and snake_case names
+_NAME_WORD_RE = re.compile(r'[A-Z][a-z]*|[a-z]+')
+
+@lru_cache(maxsize=4096)
+def _split_name_words(name: str) -> Tuple[str, ...]:
+    """
+    Split a camelCase or snake_case name into lowercase words.
+    
+    Args:
+        name: Name to split
+        
+    Returns:
+        Words of the name, in order
+    """
+    return tuple(part.lower() for part in _NAME_WORD_RE.findall(name))
+
+@lru_cache(maxsize=4096)
+def _name_match_score(name: str, keywords: Tuple[str, ...]) -> int:
+    """
+    Score a name against keywords; cached because files often share class and function names.
+    
+    Args:
+        name: Name to check
+        keywords: Lowercase keywords
+        
+    Returns:
+        Match score
+    """
+    score = 0
+    
+    # Split camelCase and snake_case names
+    name_lower = name.lower()
+    name_words = _split_name_words(name)
+    
+    # Add score for each keyword match, and for each word of the name equal to it
+    for keyword in keywords:
+        if keyword in name_lower:
+            score += 3
+        
+        score += 2 * name_words.count(keyword)
+    
+    return score
+
 class CodeLocator:
-    def __init__(self, repo_path: Path):
+    def __init__(
+        self,
+        repo_path: Path,
+        parse_cache: Optional[ParseCache] = None,
+        keyword_index: Optional[KeywordIndex] = None
+    ):
         """
         Initialize code locator.
         
         Args:
             repo_path: Path to the repository
+            parse_cache: Parse cache to use (defaults to the shared on-disk cache)
+            keyword_index: Keyword index to use (defaults to an in-memory index for this repository)
         """
         self.repo_path = repo_path
         self.code_parser = CodeParser(repo_path)
         self.project_analyzer = ProjectAnalyzer(repo_path)
+        self.parse_cache = parse_cache if parse_cache is not None else ParseCache()
+        self.keyword_index = keyword_index if keyword_index is not None else KeywordIndex(repo_path)
+        
+        # Derived from the project layout, which rarely changes between feature requests
+        self._code_files: Optional[Tuple[Dict[str, Any], List[str]]] = None
+        self._suitable_dir: Optional[Tuple[int, str]] = None
+    
+    def invalidate(self) -> None:
+        """
+        Forget everything derived from the project layout, e.g. after files were added or removed.
+        """
+        self._code_files = None
+        self._suitable_dir = None
+        self.__dict__.pop('_sync_analysis', None)
     
     async def find_suitable_locations(self, feature_description: str) -> Dict[str, Any]:
         """
@@ -59,30 +147,23 @@ class CodeLocator:
             List of keywords
         """
         # Simple keyword extraction (could be improved with NLP)
-        words = re.findall(r'\b\w+\b', feature_description.lower())
-        
-        # Filter out common stop words
-        stop_words = {
-            'a', 'an', 'the', 'and', 'or', 'but', 'if', 'in', 'on', 'to', 'with',
-            'for', 'of', 'at', 'by', 'it', 'be', 'is', 'are', 'was', 'were',
-            'has', 'have', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
-            'can', 'could', 'may', 'might', 'feature', 'implement', 'add', 'create',
-            'update', 'change', 'modify'
-        }
-        
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
+        words = _WORD_RE.findall(feature_description.lower())
         
-        # Remove duplicates while preserving order
+        # Filter out common stop words and duplicates while preserving order
         unique_keywords = []
         seen = set()
-        for keyword in keywords:
-            if keyword not in seen:
-                unique_keywords.append(keyword)
-                seen.add(keyword)
+        for word in words:
+            if len(word) > 2 and word not in _STOP_WORDS and word not in seen:
+                unique_keywords.append(word)
+                seen.add(word)
         
         return unique_keywords
     
-    async def _find_matching_files(self, keywords: List[str], project_structure: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _find_matching_files(
+        self,
+        keywords: List[str],
+        project_structure: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
         """
         Find files that match the keywords.
         
@@ -93,65 +174,91 @@ class CodeLocator:
         Returns:
             List of matching file information
         """
-        matching_files = []
-        
         # Get all code files in the project
-        code_files = self._collect_code_files(project_structure['file_structure'])
+        code_files = self._get_code_files(project_structure['file_structure'])
         
         # Get entry points from project structure
         entry_points = set(file_info['path'] for file_info in project_structure.get('important_files', []) 
                          if file_info.get('type') == 'entry_point')
         
-        # Check each file for keyword matches
+        # Look keyword occurrences up in the index, which only re-reads files changed since the last run
+        await self.keyword_index.refresh(code_files)
+        match_counts = self.keyword_index.match_counts(keywords)
+        
+        # Score into parallel lists and build records only for the top matches
+        paths = []
+        scores = []
         for file_path in code_files:
-            try:
-                content = (self.repo_path / file_path).read_text(encoding='utf-8')
-                
-                # Calculate a score based on keyword matches
-                score = 0
-                match_count = 0
-                
-                for keyword in keywords:
-                    pattern = rf'\b{re.escape(keyword)}\b'
-                    matches = re.findall(pattern, content, re.IGNORECASE)
-                    match_count += len(matches)
-                
-                # Entry points get a bonus
-                is_entry_point = file_path in entry_points
-                if is_entry_point:
-                    score += 5
-                
-                # File name match bonus
-                for keyword in keywords:
-                    if keyword.lower() in file_path.lower():
-                        score += 3
-                
-                # Match count contributes to score
-                score += min(match_count, 10)  # Cap the contribution to avoid outliers
-                
-                # Add to matching files if there's any match
-                if score > 0:
-                    language = self.code_parser.get_language_from_file(file_path)
-                    
-                    matching_files.append({
-                        'path': file_path,
-                        'score': score,
-                        'is_entry_point': is_entry_point,
-                        'language': language
-                    })
+            score = self._score_content(file_path, match_counts.get(file_path, 0), keywords, entry_points)
+            if score > 0:
+                paths.append(file_path)
+                scores.append(score)
+        
+        # Top 10 by score (descending); ties keep their collection order
+        top = heapq.nlargest(10, range(len(scores)), key=scores.__getitem__)
+        
+        return [
+            {
+                'path': paths[i],
+                'score': scores[i],
+                'is_entry_point': paths[i] in entry_points,
+                'language': self.code_parser.get_language_from_file(paths[i])
+            }
+            for i in top
+        ]
+    
+    def _score_content(
+        self,
+        file_path: str,
+        match_count: int,
+        keywords: List[str],
+        entry_points: Set[str]
+    ) -> int:
+        """
+        Score a file against the keywords.
+        
+        Args:
+            file_path: Path to the file
+            match_count: Number of keyword matches in the file's content
+            keywords: List of keywords
+            entry_points: Paths of the project's entry points
             
-            except (UnicodeDecodeError, IOError):
-                # Skip files that can't be read
-                continue
+        Returns:
+            Match score (0 if the file doesn't match at all)
+        """
+        # Calculate a score based on keyword matches
+        score = 0
         
-        # Sort by score (descending)
-        matching_files.sort(key=lambda x: x['score'], reverse=True)
+        # Entry points get a bonus
+        if file_path in entry_points:
+            score += 5
+        
+        # File name match bonus (keywords are already lowercase)
+        path_lower = file_path.lower()
+        score += 3 * sum(keyword in path_lower for keyword in keywords)
         
-        return matching_files[:10]  # Return top 10 matches
+        # Match count contributes to score
+        score += min(match_count, _MAX_KEYWORD_MATCHES)  # Cap the contribution to avoid outliers
+        
+        return score
+    
+    def _get_code_files(self, file_structure: Dict[str, Any]) -> List[str]:
+        """
+        Get the code files in a file structure, reusing the last result for the same structure.
+        
+        Args:
+            file_structure: File structure dictionary
+            
+        Returns:
+            List of code file paths
+        """
+        if self._code_files is None or self._code_files[0] is not file_structure:
+            self._code_files = (file_structure, self._collect_code_files(file_structure))
+        return self._code_files[1]
     
     def _collect_code_files(self, file_structure: Dict[str, Any], current_path: str = '') -> List[str]:
         """
-        Recursively collect code files from file structure.
+        Collect code files from file structure, depth first in the structure's order.
         
         Args:
             file_structure: File structure dictionary
@@ -165,8 +272,17 @@ class CodeLocator:
         if file_structure.get('type') != 'directory':
             return code_files
         
-        for name, info in file_structure.get('contents', {}).items():
-            path = os.path.join(current_path, name)
+        # Walk with an explicit stack of (path prefix, remaining entries) instead of recursing
+        stack = [(current_path, iter(file_structure.get('contents', {}).items()))]
+        while stack:
+            prefix, entries = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+            
+            name, info = entry
+            path = f"{prefix}{os.sep}{name}" if prefix else name
             
             if info.get('type') == 'file':
                 # Check if it's a code file (has a language)
@@ -174,8 +290,8 @@ class CodeLocator:
                     code_files.append(path)
             
             elif info.get('type') == 'directory':
-                # Recursively collect files from subdirectories
-                code_files.extend(self._collect_code_files(info, path))
+                # Descend into the subdirectory before the rest of this one
+                stack.append((path, iter(info.get('contents', {}).items())))
         
         return code_files
     
@@ -197,6 +313,7 @@ class CodeLocator:
             List of specific location information
         """
         locations = []
+        files_with_locations = set()
         
         for file_info in matching_files[:5]:  # Check top 5 matching files
             file_path = file_info['path']
@@ -206,16 +323,17 @@ class CodeLocator:
                 content = (self.repo_path / file_path).read_text(encoding='utf-8')
                 
                 # Parse the file to get structure
-                parsed_file = await self.code_parser.parse_file(file_path)
+                parsed_file = await self._cached_parse(file_path, content)
                 
                 # Find suitable classes and functions
                 for cls in parsed_file.get('classes', []):
-                    class_name = cls['name']
+                    class_name = cls.name
                     
                     # Calculate class match score
                     class_score = self._calculate_name_match_score(class_name, keywords)
                     
                     if class_score > 0:
+                        files_with_locations.add(file_path)
                         locations.append({
                             'type': 'class',
                             'file_path': file_path,
@@ -225,12 +343,13 @@ class CodeLocator:
                         })
                 
                 for func in parsed_file.get('functions', []):
-                    function_name = func['name']
+                    function_name = func.name
                     
                     # Calculate function match score
                     function_score = self._calculate_name_match_score(function_name, keywords)
                     
                     if function_score > 0:
+                        files_with_locations.add(file_path)
                         locations.append({
                             'type': 'function',
                             'file_path': file_path,
@@ -240,7 +359,7 @@ class CodeLocator:
                         })
                 
                 # If no specific locations found, recommend creating a new function
-                if not any(loc['file_path'] == file_path for loc in locations):
+                if file_path not in files_with_locations:
                     locations.append({
                         'type': 'file',
                         'file_path': file_path,
@@ -272,33 +391,40 @@ class CodeLocator:
         
         return locations
     
+    async def _cached_parse(self, file_path: str, content: str) -> Dict[str, Any]:
+        """
+        Parse a file, reusing the persisted result when its content hasn't changed.
+        
+        Args:
+            file_path: Path to the file
+            content: Content of the file
+            
+        Returns:
+            File structure information
+        """
+        digest = self.parse_cache.digest(content)
+        parsed_file = self.parse_cache.get(file_path, digest)
+        if parsed_file is not None:
+            return parsed_file
+        
+        # Parse the content already in hand rather than having the parser read the file again
+        parsed_file = await asyncio.to_thread(self.code_parser.parse_content, file_path, content)
+        if 'error' not in parsed_file:
+            self.parse_cache.set(file_path, digest, parsed_file)
+        return parsed_file
+    
     def _calculate_name_match_score(self, name: str, keywords: List[str]) -> int:
         """
         Calculate a match score for a name based on keywords.
         
         Args:
             name: Name to check
-            keywords: List of keywords
+            keywords: List of lowercase keywords
             
         Returns:
             Match score
         """
-        score = 0
-        
-        # Split camelCase and snake_case names
-        name_parts = re.findall(r'[A-Z][a-z]*|[a-z]+', name)
-        name_words = [part.lower() for part in name_parts]
-        
-        # Add score for each keyword match
-        for keyword in keywords:
-            if keyword.lower() in name.lower():
-                score += 3
-            
-            for word in name_words:
-                if keyword.lower() == word.lower():
-                    score += 2
-        
-        return score
+        return _name_match_score(name, tuple(keywords))
     
     def _determine_default_language(self, matching_files: List[Dict[str, Any]]) -> str:
         """
@@ -311,19 +437,15 @@ class CodeLocator:
             Default language
         """
         # Count language occurrences
-        language_counts = {}
-        for file_info in matching_files:
-            lang = file_info.get('language')
-            if lang:
-                language_counts[lang] = language_counts.get(lang, 0) + 1
+        language_counts = Counter(file_info['language'] for file_info in matching_files if file_info.get('language'))
         
         # Return the most common language
         if language_counts:
-            return max(language_counts.items(), key=lambda x: x[1])[0]
+            return language_counts.most_common(1)[0][0]
         
         # Get project languages from repository analysis if no matching files
         try:
-            project_structure = self.project_analyzer.analyze_sync()
+            project_structure = self.analyze_sync()
             languages = project_structure.get('languages', [])
             if languages:
                 return languages[0]
@@ -335,7 +457,24 @@ class CodeLocator:
     
     def _find_suitable_directory(self) -> str:
         """
-        Find a suitable directory for creating a new file.
+        Find a suitable directory for creating a new file, reusing the last result while the
+        repository root is unchanged.
+        
+        Returns:
+            Directory path
+        """
+        try:
+            root_mtime = os.stat(self.repo_path).st_mtime_ns
+        except OSError:
+            root_mtime = -1
+        
+        if self._suitable_dir is None or self._suitable_dir[0] != root_mtime:
+            self._suitable_dir = (root_mtime, self._scan_suitable_directory())
+        return self._suitable_dir[1]
+    
+    def _scan_suitable_directory(self) -> str:
+        """
+        Look through the repository for a suitable directory for creating a new file.
         
         Returns:
             Directory path
@@ -378,39 +517,26 @@ class CodeLocator:
             'thunks'                 # Redux thunks
         ]
         
+        # List the top-level directories once rather than probing for each candidate
+        try:
+            with os.scandir(self.repo_path) as entries:
+                top_level_dirs = {entry.name for entry in entries if entry.is_dir()}
+        except OSError:
+            top_level_dirs = set()
+        
         # First check if any of the common source directories exist
         for dir_name in common_src_dirs:
-            if (self.repo_path / dir_name).is_dir():
+            if dir_name in top_level_dirs:
                 return dir_name
         
         # Then check feature-specific directories
         for dir_name in feature_dirs:
-            if (self.repo_path / dir_name).is_dir():
+            if dir_name in top_level_dirs:
                 return dir_name
         
         # Look for most populated directory with code files
         try:
-            dirs_with_code = {}
-            for root, dirs, files in os.walk(str(self.repo_path)):
-                rel_path = os.path.relpath(root, start=str(self.repo_path))
-                if rel_path == '.':
-                    rel_path = ''
-                    
-                # Skip hidden directories and common non-code directories
-                if (rel_path.startswith('.') or 
-                    any(part.startswith('.') for part in rel_path.split(os.sep)) or
-                    any(ignored in rel_path.split(os.sep) for ignored in 
-                        ['node_modules', 'venv', '__pycache__', 'dist', 'build', 'target'])):
-                    continue
-                
-                # Count code files
-                code_files = 0
-                for file in files:
-                    if self.code_parser.get_language_from_file(os.path.join(rel_path, file)):
-                        code_files += 1
-                
-                if code_files > 0:
-                    dirs_with_code[rel_path] = code_files
+            dirs_with_code = self._count_code_files_by_directory()
             
             # Return directory with most code files
             if dirs_with_code:
@@ -421,6 +547,62 @@ class CodeLocator:
         # If nothing else, return empty string (root directory)
         return ''
     
+    def _count_code_files_by_directory(self) -> Dict[str, int]:
+        """
+        Count the code files directly inside each directory of the repository.
+        
+        Hidden and ignored directories are pruned before descending into them.
+        
+        Returns:
+            Dictionary mapping relative directory paths ('' for the root) to code file counts,
+            in top-down walk order and only for directories that contain code files
+        """
+        code_extensions = self.code_parser.extension_to_language
+        dirs_with_code: Dict[str, int] = {}
+        
+        def scan(directory: str, rel_path: str) -> None:
+            subdirs = []
+            code_files = 0
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Don't follow symlinked directories, like os.walk
+                        if not (entry.name.startswith('.') or entry.name in _IGNORED_DIRS or entry.is_symlink()):
+                            subdirs.append(entry)
+                    elif os.path.splitext(entry.name)[1].lower() in code_extensions:
+                        code_files += 1
+            
+            if code_files > 0:
+                dirs_with_code[rel_path] = code_files
+            
+            for entry in subdirs:
+                try:
+                    scan(entry.path, os.path.join(rel_path, entry.name))
+                except OSError:
+                    # Skip directories that can't be listed
+                    continue
+        
+        scan(str(self.repo_path), '')
+        return dirs_with_code
+    
+    @cached_property
+    def _sync_analysis(self) -> Dict[str, Any]:
+        """
+        Project analysis for synchronous callers, computed once per locator.
+        
+        Returns:
+            Project structure information
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop in this thread, so run (and close) one just for the analysis
+            return asyncio.run(self.project_analyzer.analyze())
+        
+        # A running loop can't be re-entered, so analyze on a fresh loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.project_analyzer.analyze()).result()
+    
     def analyze_sync(self) -> Dict[str, Any]:
         """
         Synchronous wrapper for project analysis.
@@ -428,19 +610,11 @@ class CodeLocator:
         Returns:
             Project structure information
         """
-        import asyncio
-        
         try:
-            # Try to create a new event loop for synchronous context
-            loop = asyncio.new_event_loop()
-            return loop.run_until_complete(self.project_analyzer.analyze())
-        except RuntimeError:
-            # If there's already an event loop, use it
-            loop = asyncio.get_event_loop()
-            return loop.run_until_complete(self.project_analyzer.analyze())
+            return self._sync_analysis
         except Exception:
             # If all else fails, return a minimal structure
             return {
                 'languages': [],
                 'file_structure': {'type': 'directory', 'contents': {}}
-            }
\ No newline at end of file
+            }
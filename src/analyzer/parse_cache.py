@@ -0,0 +1,98 @@
+"""
+Caches parsed file structures on disk so unchanged files skip re-parsing across runs.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.analyzer.code_parser import PARSER_VERSION
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "neurocommit" / "parse-cache.sqlite"
+
+class ParseCache:
+    def __init__(self, cache_path: Optional[Path] = DEFAULT_CACHE_PATH):
+        """
+        Initialize the parse cache.
+        
+        Args:
+            cache_path: SQLite database file, or None to keep entries in memory only
+        """
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            if cache_path is None:
+                self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+            else:
+                os.makedirs(cache_path.parent, exist_ok=True)
+                self._conn = sqlite3.connect(str(cache_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "path TEXT, sha TEXT, version INTEGER, blob BLOB, "
+                "PRIMARY KEY (path, sha, version))"
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open parse cache at {cache_path}: {str(e)}")
+            self._conn = None
+    
+    @staticmethod
+    def digest(content: str) -> str:
+        """
+        Hash file content for use as part of the cache key.
+        
+        Args:
+            content: File content
+            
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    
+    def get(self, file_path: str, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached parse result.
+        
+        Args:
+            file_path: Path to the file
+            digest: Digest of the file content
+            
+        Returns:
+            Cached parse result or None on a miss
+        """
+        if self._conn is None:
+            return None
+        
+        try:
+            row = self._conn.execute(
+                "SELECT blob FROM cache WHERE path = ? AND sha = ? AND version = ?",
+                (file_path, digest, PARSER_VERSION)
+            ).fetchone()
+            return pickle.loads(row[0]) if row else None
+        except (sqlite3.Error, pickle.UnpicklingError, AttributeError, EOFError) as e:
+            logger.warning(f"Could not read parse cache entry for {file_path}: {str(e)}")
+            return None
+    
+    def set(self, file_path: str, digest: str, parsed: Dict[str, Any]) -> None:
+        """
+        Store a parse result in the cache.
+        
+        Args:
+            file_path: Path to the file
+            digest: Digest of the file content
+            parsed: Parse result to cache
+        """
+        if self._conn is None:
+            return
+        
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (path, sha, version, blob) VALUES (?, ?, ?, ?)",
+                    (file_path, digest, PARSER_VERSION, pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write parse cache entry for {file_path}: {str(e)}")
@@ -1,22 +1,198 @@
 """
 Project structure analyzer.
 """
+import asyncio
+import hashlib
+import logging
+import mmap
 import os
 import re
-import json
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import orjson
+
+try:
+    import hyperscan
+except ImportError:  # Optional dependency: without it every JavaScript pattern is run
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
+# One pass finds every Python import, class and function; the outer group names the kind
+_PY_SYMBOL_RE = re.compile(
+    r'(?P<import>^\s*import\s+(?P<import_name>[\w.]+))'
+    r'|(?P<from_import>^\s*from\s+(?P<from_import_name>[\w.]+)\s+import)'
+    r'|(?P<class>^\s*class\s+(?P<class_name>\w+)(?:\((?P<class_parents>[^)]*)\))?:)'
+    r'|(?P<function>^\s*def\s+(?P<function_name>\w+)\s*\((?P<function_params>[^)]*)\):)',
+    re.MULTILINE
+)
+
+# JavaScript/TypeScript imports and classes in one pass
+_JS_SYMBOL_RE = re.compile(
+    r'(?P<import>import.*?from\s+[\'"](?P<import_name>[^\'"]+)[\'"])'
+    r'|(?P<require>require\s*\(\s*[\'"](?P<require_name>[^\'"]+)[\'"]\s*\))'
+    r'|(?P<class>^\s*class\s+(?P<class_name>\w+)(?:\s+extends\s+(?P<class_parent>\w+))?)',
+    re.MULTILINE
+)
+
+# Function declarations: components may be exported, plain functions must have a parameter list and no prefix
+_JS_FUNCTION_DECLARATION_RE = re.compile(
+    r'^\s*(?P<prefix>(?:export\s+)?(?:default\s+)?)function\s+(?P<name>\w+)(?:\s*\((?P<params>[^)]*)\))?',
+    re.MULTILINE
+)
+
+# Arrow functions get their own passes: a component's [^=]+ can span lines holding other definitions
+_JS_ARROW_COMPONENT_RE = re.compile(
+    r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:React\.)?(?:memo\()?(?:forwardRef\()?(?:\([^)]*\)|[^=]+)=>',
+    re.MULTILINE
+)
+_JS_ARROW_FUNCTION_RE = re.compile(
+    r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>',
+    re.MULTILINE
+)
+
+# A single Hyperscan pass over these tells which of a JavaScript file's passes can match, so the
+# others are skipped. Python isn't prefiltered: nearly every file has an import, class or def
+_JS_PREFILTER_PATTERNS = (
+    _JS_SYMBOL_RE,
+    _JS_FUNCTION_DECLARATION_RE,
+    _JS_ARROW_COMPONENT_RE,
+    _JS_ARROW_FUNCTION_RE
+)
+
+# Import-only patterns over raw bytes, for files too large for the full extraction
+_PY_IMPORT_BYTES_RE = re.compile(
+    rb'(?P<import>^\s*import\s+(?P<import_name>[\w.]+))'
+    rb'|(?P<from_import>^\s*from\s+(?P<from_import_name>[\w.]+)\s+import)',
+    re.MULTILINE
+)
+_JS_IMPORT_BYTES_RE = re.compile(
+    rb'(?P<import>import.*?from\s+[\'"](?P<import_name>[^\'"]+)[\'"])'
+    rb'|(?P<require>require\s*\(\s*[\'"](?P<require_name>[^\'"]+)[\'"]\s*\))',
+    re.MULTILINE
+)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "neurocommit" / "projects"
+
+# Bump when the analysis output changes so stale cached analyses are ignored
+_ANALYSIS_VERSION = 4
+
+# Cached analyses unused for longer than this are deleted
+_MAX_CACHE_AGE_SECONDS = 14 * 24 * 60 * 60
+
+# Most cached analyses kept; the least recently used are deleted first
+_MAX_CACHED_ANALYSES = 64
+
+# Seconds to wait for git when computing the cache key
+_GIT_TIMEOUT = 30
+
+# Directory levels covered by the file structure
+_MAX_TREE_DEPTH = 3
+
+# Files analyzed at once; threads overlap the blocking stat and read calls
+_MAX_FILE_WORKERS = 8
+
+# Larger code files are still listed, but without their classes and functions
+_MAX_EXTRACT_SIZE = 256 * 1024
+
+# Imports of larger code files are only looked for this far into the file
+_IMPORT_SCAN_LIMIT = 64 * 1024
+
+# Common entry point patterns: (path relative to the repository, language)
+_ENTRY_POINT_PATTERNS = (
+    ('main.py', 'python'),
+    ('app.py', 'python'),
+    ('index.js', 'javascript'),
+    ('server.js', 'javascript'),
+    ('src/index.js', 'javascript'),
+    ('src/main.js', 'javascript'),
+    ('src/App.js', 'javascript'),
+    ('src/index.ts', 'typescript'),
+    ('src/main.ts', 'typescript'),
+    ('src/App.ts', 'typescript'),
+    ('src/Main.java', 'java'),
+    ('src/App.java', 'java')
+)
+
+# Configuration files, in the order they are reported
+_CONFIG_FILES = (
+    '.gitignore',
+    '.env',
+    '.env.example',
+    'docker-compose.yml',
+    'Dockerfile',
+    'tsconfig.json',
+    'webpack.config.js',
+    'babel.config.js',
+    '.eslintrc.js',
+    '.eslintrc.json',
+    'jest.config.js',
+    'pyproject.toml',
+    'setup.cfg',
+    'tox.ini',
+    'pytest.ini'
+)
+
+# Documentation files, in the order they are reported
+_DOC_FILES = (
+    'README.md',
+    'CONTRIBUTING.md',
+    'CHANGELOG.md',
+    'LICENSE',
+    'docs/index.md'
+)
+
+@lru_cache(maxsize=None)
+def _hyperscan_database() -> Optional[Any]:
+    """
+    Compile the JavaScript patterns into one Hyperscan database, once per process.
+    
+    Returns:
+        Database whose pattern ids index _JS_PREFILTER_PATTERNS, or None if Hyperscan can't be used
+    """
+    if hyperscan is None:
+        return None
+    
+    flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_MULTILINE
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[pattern.pattern.encode('utf-8') for pattern in _JS_PREFILTER_PATTERNS],
+            ids=list(range(len(_JS_PREFILTER_PATTERNS))),
+            elements=len(_JS_PREFILTER_PATTERNS),
+            flags=[flags] * len(_JS_PREFILTER_PATTERNS)
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Could not compile Hyperscan patterns: {str(e)}")
+        return None
+    
+    return database
 
 class ProjectAnalyzer:
-    def __init__(self, repo_path: Path):
+    def __init__(self, repo_path: Path, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR):
         """
         Initialize project analyzer with repository path.
         
         Args:
             repo_path: Path to the repository
+            cache_dir: Directory for cached analyses of git repositories, or None to always analyze
         """
         self.repo_path = repo_path
-        self.ignored_dirs = {'.git', 'node_modules', 'venv', '__pycache__', 'dist', 'build'}
+        self.cache_dir = cache_dir
+        self._file_listings: Dict[str, Set[str]] = {}
+        # Hyperscan scratch space can't be shared between the file worker threads
+        self._hyperscan_local = threading.local()
+        # Pruned before descending, so none of their (often huge) contents are listed
+        self.ignored_dirs = {
+            '.git', 'node_modules', 'venv', '.venv', '__pycache__', 'dist', 'build', 'target', '.next',
+            '.mypy_cache', '.pytest_cache', '.tox', 'coverage', 'site-packages'
+        }
         self.code_extensions = {
             '.py': 'python',
             '.js': 'javascript',
@@ -43,32 +219,241 @@ class ProjectAnalyzer:
         Returns:
             Dictionary with project structure information
         """
+        # The analysis is blocking file I/O, so keep it off the event loop
+        return await asyncio.to_thread(self._analyze_project)
+    
+    def _analyze_project(self) -> Dict[str, Any]:
+        """
+        Analyze the project structure, blocking on file I/O, reusing a cached analysis of the same
+        repository state when there is one.
+        
+        Returns:
+            Dictionary with project structure information
+        """
+        cache_path = self._analysis_cache_path()
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'rb') as f:
+                    project_info = orjson.loads(f.read())
+                # Mark the entry as recently used so eviction keeps it
+                os.utime(cache_path)
+                return project_info
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read cached project analysis at {cache_path}: {str(e)}")
+        
+        project_info = self._collect_project_info()
+        
+        if cache_path is not None:
+            try:
+                os.makedirs(cache_path.parent, exist_ok=True)
+                # Write to a temporary file first so a crash never leaves a truncated entry behind
+                tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(project_info))
+                os.replace(tmp_path, cache_path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Could not cache project analysis at {cache_path}: {str(e)}")
+            self._evict_stale_analyses()
+        
+        return project_info
+    
+    def _analysis_cache_path(self) -> Optional[Path]:
+        """
+        Find the cache entry for the repository's current state.
+        
+        The key covers the project name, the HEAD commit, the project's place in the work tree and
+        the working tree status, including gitignored paths, all independent of where the
+        repository is checked out, so clones of the same state share an entry. Modified, untracked and ignored files add their mtime and size, and
+        untracked or ignored directories add every file the analysis could reach inside them, so an
+        edit anywhere the analysis looks yields a new key. Directories in ignored_dirs and paths
+        below the depth of the file structure are left out, as the analysis never reads them.
+        
+        Returns:
+            Path of the cache entry, or None if caching is disabled or the repository state is unknown
+        """
+        if self.cache_dir is None:
+            return None
+        
+        try:
+            head = subprocess.run(
+                ['git', '-C', str(self.repo_path), 'rev-parse', '--show-toplevel', 'HEAD'],
+                capture_output=True, timeout=_GIT_TIMEOUT
+            )
+            # Untracked and ignored directories are listed once rather than file by file
+            status = subprocess.run(
+                ['git', '-C', str(self.repo_path), 'status', '--porcelain', '-z', '--ignored=matching'],
+                capture_output=True, timeout=_GIT_TIMEOUT
+            )
+        except (OSError, subprocess.SubprocessError):
+            # Git missing or hung; analyze without caching
+            return None
+        
+        if head.returncode != 0 or status.returncode != 0:
+            return None
+        
+        # Status paths are relative to the top of the work tree, which may be above repo_path
+        top_level, _, commit = head.stdout.partition(b'\n')
+        repo_root = os.fsencode(os.path.abspath(self.repo_path))
+        
+        key = hashlib.blake2b(digest_size=16)
+        for part in (
+            str(_ANALYSIS_VERSION).encode(),
+            self.repo_path.name.encode('utf-8'),
+            commit,
+            os.path.relpath(repo_root, top_level),
+            status.stdout,
+        ):
+            key.update(part)
+            key.update(b'\0')
+        
+        # Further edits to an already modified file don't change the status output, but do change its stat
+        records = status.stdout.split(b'\0')
+        i = 0
+        while i < len(records):
+            record = records[i]
+            i += 1
+            if len(record) < 4:
+                continue
+            
+            # Renames and copies are followed by their source path
+            if record[:1] in (b'R', b'C'):
+                i += 1
+            
+            path = os.path.normpath(os.path.join(top_level, record[3:]))
+            parts = os.path.relpath(path, repo_root).split(os.sep.encode())
+            is_dir = record.endswith(b'/')
+            
+            # Outside the analyzed directory, or somewhere the analysis never descends
+            parent_dirs = parts if is_dir else parts[:-1]
+            if parts[0] == b'..' or any(os.fsdecode(part) in self.ignored_dirs for part in parent_dirs):
+                continue
+            
+            if is_dir:
+                self._hash_directory_state(key, path, repo_root, len(parts))
+                continue
+            
+            try:
+                stat = os.stat(path)
+                key.update(f'{stat.st_mtime_ns}:{stat.st_size}\0'.encode())
+            except OSError:
+                key.update(b'-\0')
+        
+        return self.cache_dir / f"{key.hexdigest()}.json"
+    
+    def _hash_directory_state(self, key: Any, directory: bytes, repo_root: bytes, depth: int) -> None:
+        """
+        Add the names, mtimes and sizes of the files the analysis can reach in an untracked or
+        ignored directory to a cache key; git status lists only the directory itself.
+        
+        Args:
+            key: Hash object to update
+            directory: Absolute path of the directory
+            repo_root: Absolute path of the repository; names are hashed relative to it
+            depth: Number of path components from the repository root to the directory
+        """
+        # Only the name of a directory at the depth limit appears in the file structure
+        if depth >= _MAX_TREE_DEPTH:
+            return
+        
+        for dir_path, dir_names, file_names in os.walk(directory):
+            level = depth + dir_path[len(directory):].count(os.sep.encode())
+            dir_names[:] = sorted(name for name in dir_names if os.fsdecode(name) not in self.ignored_dirs)
+            rel_dir = os.path.relpath(dir_path, repo_root)
+            for name in dir_names:
+                key.update(os.path.join(rel_dir, name) + b'/\0')
+            
+            for name in sorted(file_names):
+                path = os.path.join(dir_path, name)
+                try:
+                    stat = os.stat(path)
+                    key.update(os.path.join(rel_dir, name) + f'\0{stat.st_mtime_ns}:{stat.st_size}\0'.encode())
+                except OSError:
+                    key.update(os.path.join(rel_dir, name) + b'\0-\0')
+            
+            # Subdirectories at the depth limit are listed by name but not descended into
+            if level + 1 >= _MAX_TREE_DEPTH:
+                dir_names[:] = []
+    
+    def _evict_stale_analyses(self) -> None:
+        """
+        Delete cached analyses unused for longer than _MAX_CACHE_AGE_SECONDS, and the least recently
+        used ones beyond _MAX_CACHED_ANALYSES, so the cache directory doesn't grow without bound.
+        """
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.json'):
+                        try:
+                            entries.append((entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            continue
+        except OSError:
+            return
+        
+        entries.sort(reverse=True)
+        cutoff = time.time() - _MAX_CACHE_AGE_SECONDS
+        for i, (mtime, path) in enumerate(entries):
+            if i >= _MAX_CACHED_ANALYSES or mtime < cutoff:
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    logger.debug(f"Could not delete cached project analysis {path}: {str(e)}")
+    
+    def _collect_project_info(self) -> Dict[str, Any]:
+        """
+        Analyze the project structure from scratch.
+        
+        Returns:
+            Dictionary with project structure information
+        """
+        # Directory listings are shared by the existence checks of this run only
+        self._file_listings = {}
+        
         project_info = {
             'name': self.repo_path.name,
-            'languages': set(),
+            'languages': [],
             'file_structure': {},
-            'dependencies': await self._detect_dependencies(),
-            'entry_points': await self._find_entry_points(),
+            'dependencies': self._detect_dependencies(),
+            'entry_points': self._find_entry_points(),
             'important_files': []
         }
         
-        # Analyze file structure
-        project_info['file_structure'] = await self._analyze_directory(self.repo_path)
+        # Analyze file structure: walk the directories first, then analyze the files in parallel
+        pending_files = []
+        project_info['file_structure'] = self._analyze_directory(self.repo_path, pending_files=pending_files)
+        
+        with ThreadPoolExecutor(max_workers=_MAX_FILE_WORKERS) as executor:
+            file_infos = executor.map(
+                self._analyze_file,
+                [file_entry for _, file_entry, _ in pending_files],
+                [relative_path for _, _, relative_path in pending_files]
+            )
+            
+            # Languages are collected here rather than by the workers, in the order files were found
+            languages = {}
+            for (contents, file_entry, _), file_info in zip(pending_files, file_infos):
+                contents[file_entry.name] = file_info
+                if 'language' in file_info:
+                    languages[file_info['language']] = None
         
         # Identify important files
-        project_info['important_files'] = await self._identify_important_files()
+        project_info['important_files'] = self._identify_important_files()
         
-        # Convert languages set to list for JSON serialization
-        project_info['languages'] = list(project_info['languages'])
+        # Languages as a list for JSON serialization
+        project_info['languages'] = list(languages)
         
         return project_info
     
-    async def _analyze_directory(
+    def _analyze_directory(
         self, 
         directory: Path, 
         relative_path: str = '', 
-        max_depth: int = 3,
-        max_files_per_dir: int = 10
+        max_depth: int = _MAX_TREE_DEPTH,
+        max_files_per_dir: int = 10,
+        pending_files: Optional[List[Tuple[Dict[str, Any], os.DirEntry, str]]] = None
     ) -> Dict[str, Any]:
         """
         Recursively analyze a directory.
@@ -78,7 +463,9 @@ class ProjectAnalyzer:
             relative_path: Path relative to repository root
             max_depth: Maximum recursion depth
             max_files_per_dir: Maximum number of files to analyze per directory
-            
+            pending_files: If given, files are not analyzed here but queued as (contents, entry,
+                relative path) for the caller to analyze and store in contents
+                
         Returns:
             Directory analysis results
         """
@@ -87,31 +474,48 @@ class ProjectAnalyzer:
         
         result = {'type': 'directory', 'contents': {}}
         
+        # Classify entries in the same pass that lists them; DirEntry caches the file type from the listing
+        dirs = []
+        files = []
         try:
-            entries = list(directory.iterdir())
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if entry.name not in self.ignored_dirs:
+                            dirs.append(entry)
+                    elif entry.is_file():
+                        files.append(entry)
         except (PermissionError, OSError):
             return {'type': 'directory', 'error': 'Access denied'}
         
         # Sort entries (directories first, then files)
-        dirs = sorted([e for e in entries if e.is_dir() and e.name not in self.ignored_dirs])
-        files = sorted([e for e in entries if e.is_file()])
+        dirs.sort(key=lambda e: e.name)
+        files.sort(key=lambda e: e.name)
         
         # Process directories
-        for dir_path in dirs:
-            dir_rel_path = os.path.join(relative_path, dir_path.name)
-            result['contents'][dir_path.name] = await self._analyze_directory(
-                dir_path, 
+        for dir_entry in dirs:
+            dir_rel_path = os.path.join(relative_path, dir_entry.name)
+            result['contents'][dir_entry.name] = self._analyze_directory(
+                Path(dir_entry.path), 
                 dir_rel_path, 
                 max_depth - 1,
-                max_files_per_dir
+                max_files_per_dir,
+                pending_files
             )
         
         # Process files (up to max_files_per_dir)
         file_count = min(len(files), max_files_per_dir)
-        for file_path in files[:file_count]:
-            file_info = await self._analyze_file(file_path, os.path.join(relative_path, file_path.name))
+        for file_entry in files[:file_count]:
+            file_rel_path = os.path.join(relative_path, file_entry.name)
+            if pending_files is not None:
+                # Reserve the slot so contents keep their order once the file is analyzed
+                result['contents'][file_entry.name] = None
+                pending_files.append((result['contents'], file_entry, file_rel_path))
+                continue
+            
+            file_info = self._analyze_file(file_entry, file_rel_path)
             if file_info:
-                result['contents'][file_path.name] = file_info
+                result['contents'][file_entry.name] = file_info
         
         # Indicate if we truncated the file list
         if len(files) > max_files_per_dir:
@@ -119,28 +523,31 @@ class ProjectAnalyzer:
         
         return result
     
-    async def _analyze_file(self, file_path: Path, relative_path: str) -> Optional[Dict[str, Any]]:
+    def _analyze_file(self, file_entry: os.DirEntry, relative_path: str) -> Optional[Dict[str, Any]]:
         """
         Analyze a single file.
         
         Args:
-            file_path: File path
+            file_entry: Directory entry for the file
             relative_path: Path relative to repository root
             
         Returns:
             File analysis results or None if file should be ignored
         """
+        # One stat serves the size limit and the file info
+        stat = file_entry.stat()
+        
         # Skip large files
-        if file_path.stat().st_size > 1_000_000:  # 1MB
-            return {'type': 'file', 'size': file_path.stat().st_size, 'too_large': True}
+        if stat.st_size > 1_000_000:  # 1MB
+            return {'type': 'file', 'size': stat.st_size, 'too_large': True}
         
         # Get file extension
-        _, ext = os.path.splitext(file_path.name.lower())
+        _, ext = os.path.splitext(file_entry.name.lower())
         
         file_info = {
             'type': 'file',
-            'size': file_path.stat().st_size,
-            'last_modified': file_path.stat().st_mtime
+            'size': stat.st_size,
+            'last_modified': stat.st_mtime
         }
         
         # Detect language based on extension
@@ -148,191 +555,211 @@ class ProjectAnalyzer:
             language = self.code_extensions[ext]
             file_info['language'] = language
             
-            # Add language to project languages
-            # Call it as a method to satisfy mypy
-            self._add_language(language)
-            
-            # For Python, JavaScript and TypeScript files, extract imports
-            if ext in ['.py', '.js', '.ts', '.jsx', '.tsx']:
+            # For Python, JavaScript and TypeScript files, extract imports (regex cost grows with file size)
+            if ext in ['.py', '.js', '.ts', '.jsx', '.tsx'] and stat.st_size <= _MAX_EXTRACT_SIZE:
                 try:
-                    content = file_path.read_text(encoding='utf-8')
+                    # Read the whole file in one call and decode it in one pass, skipping the text-mode wrapper
+                    with open(file_entry.path, 'rb') as f:
+                        content = f.read().decode('utf-8')
+                    
+                    # Match text mode's universal newlines so the patterns behave the same
+                    if '\r' in content:
+                        content = content.replace('\r\n', '\n').replace('\r', '\n')
                     
-                    # Extract imports
-                    imports = await self._extract_imports(content, ext)
+                    # Extract imports, classes and functions (basic implementation) in one pass
+                    imports, classes, functions = self._extract_all(content, ext)
                     if imports:
                         file_info['imports'] = imports
                     
-                    # Extract classes and functions (basic implementation)
-                    classes = await self._extract_classes(content, ext)
                     if classes:
                         file_info['classes'] = classes
                     
-                    functions = await self._extract_functions(content, ext)
                     if functions:
                         file_info['functions'] = functions
-                    
+                
                 except (UnicodeDecodeError, PermissionError, OSError):
                     file_info['error'] = 'Could not read file'
+            
+            elif ext in ['.py', '.js', '.ts', '.jsx', '.tsx']:
+                try:
+                    imports = self._extract_header_imports(file_entry.path, ext)
+                    if imports:
+                        file_info['imports'] = imports
+                
+                except (PermissionError, OSError, ValueError):
+                    file_info['error'] = 'Could not read file'
         
         return file_info
     
-    def _add_language(self, language: str) -> None:
-        """
-        Add a language to the project languages set.
-        """
-        if hasattr(self, 'project_info'):
-            self.project_info['languages'].add(language)
-    
-    async def _extract_imports(self, content: str, ext: str) -> List[str]:
+    def _extract_header_imports(self, file_path: str, ext: str) -> List[str]:
         """
-        Extract import statements from file content.
+        Extract the imports near the top of a large file.
+        
+        The file is memory-mapped and matched as bytes, so only the scanned pages are read and
+        nothing is decoded apart from the captured module names.
         
         Args:
-            content: File content
+            file_path: Path to the file
             ext: File extension
             
         Returns:
             List of import statements
         """
-        imports = []
-        
-        if ext == '.py':
-            # Python imports
-            import_patterns = [
-                r'^\s*import\s+([\w.]+)',
-                r'^\s*from\s+([\w.]+)\s+import'
-            ]
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Stop at the last complete line so a statement is never cut in half
+            end = len(mm)
+            if end > _IMPORT_SCAN_LIMIT:
+                end = mm.rfind(b'\n', 0, _IMPORT_SCAN_LIMIT) + 1
             
-            for pattern in import_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    imports.append(match.group(1))
-        
-        elif ext in ['.js', '.jsx', '.ts', '.tsx']:
-            # JavaScript/TypeScript imports
-            import_patterns = [
-                r'import.*?from\s+[\'"]([^\'"]+)[\'"]',
-                r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
-            ]
+            if ext == '.py':
+                pattern, first_kind, second_kind = _PY_IMPORT_BYTES_RE, 'import', 'from_import'
+            else:
+                pattern, first_kind, second_kind = _JS_IMPORT_BYTES_RE, 'import', 'require'
             
-            for pattern in import_patterns:
-                for match in re.finditer(pattern, content):
-                    imports.append(match.group(1))
+            # Keep the same order as the full extraction: plain or ES imports first
+            names = {first_kind: [], second_kind: []}
+            for match in pattern.finditer(mm, 0, end):
+                kind = match.lastgroup
+                names[kind].append(match.group(f'{kind}_name').decode('utf-8', 'replace'))
         
-        return imports
+        return names[first_kind] + names[second_kind]
     
-    async def _extract_classes(self, content: str, ext: str) -> List[Dict[str, Any]]:
+    def _extract_all(self, content: str, ext: str) -> Tuple[List[str], List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Extract class definitions from file content.
+        Extract imports, class definitions and function definitions from file content.
         
         Args:
             content: File content
             ext: File extension
             
         Returns:
-            List of class information
+            Tuple of (import statements, class information, function information)
         """
+        imports = []
         classes = []
+        functions = []
         
         if ext == '.py':
-            # Python classes
-            class_pattern = r'^\s*class\s+(\w+)(?:\(([^)]*)\))?:'
-            
-            for match in re.finditer(class_pattern, content, re.MULTILINE):
-                class_name = match.group(1)
-                parent_classes = []
+            # Plain imports are listed before from-imports
+            from_imports = []
+            for match in _PY_SYMBOL_RE.finditer(content):
+                kind = match.lastgroup
+                if kind == 'import':
+                    imports.append(match.group('import_name'))
                 
-                if match.group(2):
-                    parent_classes = [p.strip() for p in match.group(2).split(',')]
+                elif kind == 'from_import':
+                    from_imports.append(match.group('from_import_name'))
                 
-                classes.append({
-                    'name': class_name,
-                    'parent_classes': parent_classes
-                })
+                elif kind == 'class':
+                    parent_classes = []
+                    if match.group('class_parents'):
+                        parent_classes = [p.strip() for p in match.group('class_parents').split(',')]
+                    
+                    classes.append({
+                        'name': match.group('class_name'),
+                        'parent_classes': parent_classes
+                    })
+                
+                else:
+                    function_name = match.group('function_name')
+                    
+                    # Skip private methods
+                    if function_name.startswith('_') and function_name != '__init__':
+                        continue
+                    
+                    functions.append({
+                        'name': function_name,
+                        'params': match.group('function_params').strip()
+                    })
+            
+            imports.extend(from_imports)
         
         elif ext in ['.js', '.jsx', '.ts', '.tsx']:
-            # JavaScript/TypeScript classes
-            class_pattern = r'^\s*class\s+(\w+)(?:\s+extends\s+(\w+))?'
+            present = self._js_patterns_present(content)
             
-            for match in re.finditer(class_pattern, content, re.MULTILINE):
-                class_name = match.group(1)
-                parent_class = match.group(2)
+            def wanted(pattern: re.Pattern) -> bool:
+                return present is None or pattern in present
+            
+            # ES imports are listed before require() calls
+            requires = []
+            for match in _JS_SYMBOL_RE.finditer(content) if wanted(_JS_SYMBOL_RE) else ():
+                kind = match.lastgroup
+                if kind == 'import':
+                    imports.append(match.group('import_name'))
                 
-                classes.append({
-                    'name': class_name,
-                    'parent_classes': [parent_class] if parent_class else []
-                })
+                elif kind == 'require':
+                    requires.append(match.group('require_name'))
+                
+                else:
+                    parent_class = match.group('class_parent')
+                    classes.append({
+                        'name': match.group('class_name'),
+                        'parent_classes': [parent_class] if parent_class else []
+                    })
+            
+            imports.extend(requires)
+            
+            # React components conventionally start with uppercase; function components come first
+            arrow_functions = []
+            for match in _JS_FUNCTION_DECLARATION_RE.finditer(content) if wanted(_JS_FUNCTION_DECLARATION_RE) else ():
+                name = match.group('name')
+                if name[0].isupper():
+                    classes.append({
+                        'name': name,
+                        'type': 'component'
+                    })
+                
+                # Skip private functions
+                if not match.group('prefix') and match.group('params') is not None and not name.startswith('_'):
+                    functions.append({
+                        'name': name,
+                        'params': match.group('params').strip()
+                    })
             
-            # Also detect React components
-            component_patterns = [
-                r'^\s*(?:export\s+)?(?:default\s+)?function\s+(\w+)',
-                r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:React\.)?(?:memo\()?(?:forwardRef\()?(?:\([^)]*\)|[^=]+)=>'
-            ]
+            for match in _JS_ARROW_COMPONENT_RE.finditer(content) if wanted(_JS_ARROW_COMPONENT_RE) else ():
+                if match.group(1)[0].isupper():
+                    classes.append({
+                        'name': match.group(1),
+                        'type': 'component'
+                    })
             
-            for pattern in component_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    component_name = match.group(1)
-                    if component_name[0].isupper():  # React components conventionally start with uppercase
-                        classes.append({
-                            'name': component_name,
-                            'type': 'component'
-                        })
-        
-        return classes
+            for match in _JS_ARROW_FUNCTION_RE.finditer(content) if wanted(_JS_ARROW_FUNCTION_RE) else ():
+                # Skip private functions
+                if not match.group(1).startswith('_'):
+                    functions.append({
+                        'name': match.group(1),
+                        'params': match.group(2).strip()
+                    })
+        
+        return imports, classes, functions
     
-    async def _extract_functions(self, content: str, ext: str) -> List[Dict[str, Any]]:
+    def _js_patterns_present(self, content: str) -> Optional[Set[re.Pattern]]:
         """
-        Extract function definitions from file content.
+        Find which JavaScript patterns match a file with a single Hyperscan pass over all of them.
         
         Args:
             content: File content
-            ext: File extension
             
         Returns:
-            List of function information
+            Set of patterns with at least one match, or None if Hyperscan is unavailable
         """
-        functions = []
+        database = _hyperscan_database()
+        if database is None:
+            return None
         
-        if ext == '.py':
-            # Python functions
-            function_pattern = r'^\s*def\s+(\w+)\s*\(([^)]*)\):'
-            
-            for match in re.finditer(function_pattern, content, re.MULTILINE):
-                function_name = match.group(1)
-                params = match.group(2).strip()
-                
-                # Skip private methods
-                if function_name.startswith('_') and function_name != '__init__':
-                    continue
-                
-                functions.append({
-                    'name': function_name,
-                    'params': params
-                })
+        scratch = getattr(self._hyperscan_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hyperscan_local.scratch = hyperscan.Scratch(database)
         
-        elif ext in ['.js', '.jsx', '.ts', '.tsx']:
-            # JavaScript/TypeScript functions
-            function_patterns = [
-                r'^\s*function\s+(\w+)\s*\(([^)]*)\)',
-                r'^\s*(?:export\s+)?(?:default\s+)?const\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>'
-            ]
-            
-            for pattern in function_patterns:
-                for match in re.finditer(pattern, content, re.MULTILINE):
-                    function_name = match.group(1)
-                    params = match.group(2).strip()
-                    
-                    # Skip private methods
-                    if function_name.startswith('_'):
-                        continue
-                    
-                    functions.append({
-                        'name': function_name,
-                        'params': params
-                    })
+        found = set()
         
-        return functions
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            found.add(_JS_PREFILTER_PATTERNS[pattern_id])
+        
+        database.scan(content.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+        return found
     
-    async def _detect_dependencies(self) -> Dict[str, Any]:
+    def _detect_dependencies(self) -> Dict[str, Any]:
         """
         Detect project dependencies.
         
@@ -345,21 +772,24 @@ class ProjectAnalyzer:
         package_json_path = self.repo_path / 'package.json'
         if package_json_path.exists():
             try:
-                package_data = json.loads(package_json_path.read_text(encoding='utf-8'))
+                # orjson parses the raw bytes directly, with no separate decode step
+                package_data = orjson.loads(package_json_path.read_bytes())
                 dependencies['node'] = {
                     'dependencies': package_data.get('dependencies', {}),
                     'devDependencies': package_data.get('devDependencies', {})
                 }
-            except (json.JSONDecodeError, UnicodeDecodeError):
+            except (orjson.JSONDecodeError, OSError):
                 pass
         
         # Check for requirements.txt (Python)
         requirements_path = self.repo_path / 'requirements.txt'
         if requirements_path.exists():
             try:
-                requirements = requirements_path.read_text(encoding='utf-8').splitlines()
+                # Filter lines as they are read, rather than holding the whole text and a list of its lines
+                with open(requirements_path, encoding='utf-8') as f:
+                    requirements = [r.strip() for r in f if r.strip() and not r.startswith('#')]
                 dependencies['python'] = {
-                    'requirements': [r.strip() for r in requirements if r.strip() and not r.startswith('#')]
+                    'requirements': requirements
                 }
             except UnicodeDecodeError:
                 pass
@@ -393,7 +823,30 @@ class ProjectAnalyzer:
         
         return dependencies
     
-    async def _find_entry_points(self) -> List[str]:
+    def _is_repo_file(self, relative_path: str) -> bool:
+        """
+        Check whether a file exists, answering from one listing per directory instead of a stat per path.
+        
+        Args:
+            relative_path: Path relative to repository root, with '/' separators
+            
+        Returns:
+            True if the path names a file
+        """
+        directory, name = os.path.split(relative_path)
+        
+        listing = self._file_listings.get(directory)
+        if listing is None:
+            try:
+                with os.scandir(self.repo_path / directory) as it:
+                    listing = {entry.name for entry in it if entry.is_file()}
+            except OSError:
+                listing = set()
+            self._file_listings[directory] = listing
+        
+        return name in listing
+    
+    def _find_entry_points(self) -> List[str]:
         """
         Find potential entry points for the application.
         
@@ -402,29 +855,14 @@ class ProjectAnalyzer:
         """
         entry_points = []
         
-        # Common entry point patterns
-        entry_point_patterns = [
-            (self.repo_path / 'main.py', 'python'),
-            (self.repo_path / 'app.py', 'python'),
-            (self.repo_path / 'index.js', 'javascript'),
-            (self.repo_path / 'server.js', 'javascript'),
-            (self.repo_path / 'src/index.js', 'javascript'),
-            (self.repo_path / 'src/main.js', 'javascript'),
-            (self.repo_path / 'src/App.js', 'javascript'),
-            (self.repo_path / 'src/index.ts', 'typescript'),
-            (self.repo_path / 'src/main.ts', 'typescript'),
-            (self.repo_path / 'src/App.ts', 'typescript'),
-            (self.repo_path / 'src/Main.java', 'java'),
-            (self.repo_path / 'src/App.java', 'java')
-        ]
-        
-        for path, language in entry_point_patterns:
-            if path.exists() and path.is_file():
-                entry_points.append(str(path.relative_to(self.repo_path)))
+        # Each directory is listed once, so this is a set lookup per pattern rather than a stat
+        for path, language in _ENTRY_POINT_PATTERNS:
+            if self._is_repo_file(path):
+                entry_points.append(str(Path(path)))
         
         return entry_points
     
-    async def _identify_important_files(self) -> List[Dict[str, Any]]:
+    def _identify_important_files(self) -> List[Dict[str, Any]]:
         """
         Identify important files in the project.
         
@@ -434,51 +872,23 @@ class ProjectAnalyzer:
         important_files = []
         
         # Configuration files
-        config_files = [
-            '.gitignore',
-            '.env',
-            '.env.example',
-            'docker-compose.yml',
-            'Dockerfile',
-            'tsconfig.json',
-            'webpack.config.js',
-            'babel.config.js',
-            '.eslintrc.js',
-            '.eslintrc.json',
-            'jest.config.js',
-            'pyproject.toml',
-            'setup.cfg',
-            'tox.ini',
-            'pytest.ini'
-        ]
-        
-        for filename in config_files:
-            file_path = self.repo_path / filename
-            if file_path.exists() and file_path.is_file():
+        for filename in _CONFIG_FILES:
+            if self._is_repo_file(filename):
                 important_files.append({
                     'path': filename,
                     'type': 'config'
                 })
         
         # Documentation files
-        doc_files = [
-            'README.md',
-            'CONTRIBUTING.md',
-            'CHANGELOG.md',
-            'LICENSE',
-            'docs/index.md'
-        ]
-        
-        for filename in doc_files:
-            file_path = self.repo_path / filename
-            if file_path.exists() and file_path.is_file():
+        for filename in _DOC_FILES:
+            if self._is_repo_file(filename):
                 important_files.append({
                     'path': filename,
                     'type': 'documentation'
                 })
         
         # Entry points
-        entry_points = await self._find_entry_points()
+        entry_points = self._find_entry_points()
         for entry_point in entry_points:
             important_files.append({
                 'path': entry_point,
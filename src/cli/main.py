@@ -6,10 +6,11 @@ import asyncio
 import logging
 import os
 import sys
-import json
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+import orjson
+
 # Add project root to Python path to allow importing from src
 project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -42,9 +43,9 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
         config_path = os.path.join(project_root, 'config', 'default.json')
     
     try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except (IOError, json.JSONDecodeError) as e:
+        with open(config_path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (IOError, orjson.JSONDecodeError) as e:
         logger.error(f"Error loading config from {config_path}: {str(e)}")
         
         # Return default configuration
@@ -74,6 +75,7 @@ async def main() -> None:
         choices=["auto", "python", "javascript", "typescript", "java", "solidity"],
         help="Preferred programming language"
     )
+    implement_parser.add_argument("--in-memory", action="store_true", help="Clone the repository onto a RAM disk (/dev/shm)")
     
     # Fix bug command
     fix_parser = subparsers.add_parser("fix", help="Fix a bug in a repository")
@@ -82,6 +84,7 @@ async def main() -> None:
     fix_parser.add_argument("--target-branch", default="main", help="Target branch for the PR")
     fix_parser.add_argument("--config", help="Path to config file")
     fix_parser.add_argument("--language", default="auto", help="Preferred programming language (python, javascript, etc.)")
+    fix_parser.add_argument("--in-memory", action="store_true", help="Clone the repository onto a RAM disk (/dev/shm)")
 
 
     
@@ -97,6 +100,8 @@ async def main() -> None:
     
     # Load configuration
     config = load_config(args.config if hasattr(args, "config") else None)
+    if getattr(args, "in_memory", False):
+        config["in_memory_workdir"] = True
     
     # Check for required configuration
     if not config.get("github_token"):
@@ -110,42 +115,46 @@ async def main() -> None:
     # Create orchestrator
     orchestrator = Orchestrator(config)
     
-    if args.command == "implement":
-        # Implement a feature
-        pr_url = await orchestrator.process_request(
-            args.repo_url,
-            args.description,
-            args.target_branch
-        )
+    try:
+        if args.command == "implement":
+            # Implement a feature
+            pr_url = await orchestrator.process_request(
+                args.repo_url,
+                args.description,
+                args.target_branch
+            )
         
-        if pr_url.startswith("Error:"):
-            logger.error(pr_url)
-        else:
-            logger.info(f"Feature implementation PR created: {pr_url}")
+            if pr_url.startswith("Error:"):
+                logger.error(pr_url)
+            else:
+                logger.info(f"Feature implementation PR created: {pr_url}")
     
-    elif args.command == "fix":
-        # Fix a bug (same as implement, but with different description semantics)
-        pr_url = await orchestrator.process_request(
-            args.repo_url,
-            f"Fix bug: {args.description}",
-            args.target_branch
-        )
+        elif args.command == "fix":
+            # Fix a bug (same as implement, but with different description semantics)
+            pr_url = await orchestrator.process_request(
+                args.repo_url,
+                f"Fix bug: {args.description}",
+                args.target_branch
+            )
         
-        if pr_url.startswith("Error:"):
-            logger.error(pr_url)
-        else:
-            logger.info(f"Bug fix PR created: {pr_url}")
+            if pr_url.startswith("Error:"):
+                logger.error(pr_url)
+            else:
+                logger.info(f"Bug fix PR created: {pr_url}")
     
-    elif args.command == "status":
-        # Check status of pending tasks
-        stats = orchestrator.task_queue.get_stats()
+        elif args.command == "status":
+            # Check status of pending tasks
+            stats = orchestrator.task_queue.get_stats()
         
-        print("Task queue status:")
-        print(f"  Pending: {stats['pending']}")
-        print(f"  In progress: {stats['in_progress']}")
-        print(f"  Completed: {stats['completed']}")
-        print(f"  Failed: {stats['failed']}")
-        print(f"  Total: {stats['total']}")
+            print("Task queue status:")
+            print(f"  Pending: {stats['pending']}")
+            print(f"  In progress: {stats['in_progress']}")
+            print(f"  Completed: {stats['completed']}")
+            print(f"  Failed: {stats['failed']}")
+            print(f"  Total: {stats['total']}")
+    finally:
+        # Release the shared Claude HTTP session
+        await orchestrator.claude_client.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
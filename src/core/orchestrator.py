@@ -12,12 +12,16 @@ from src.core.queue import TaskQueue
 from src.repo.github_client import GitHubClient
 from src.repo.git_operations import GitOperations
 from src.ai.claude_client import ClaudeClient
+from src.ai.response_cache import DEFAULT_CACHE_DIR, DEFAULT_SIZE_LIMIT, DEFAULT_TTL_SECONDS, ResponseCache
 from src.analyzer.project import ProjectAnalyzer
 from src.editor.code_editor import CodeEditor
 from src.testing.runner import TestRunner
 
 logger = logging.getLogger(__name__)
 
+# tmpfs mount present on most Linux systems
+_RAM_DISK = "/dev/shm"
+
 class Orchestrator:
     def __init__(self, config: Dict[str, Any]):
         """
@@ -29,7 +33,43 @@ class Orchestrator:
         self.config = config
         self.task_queue = TaskQueue()
         self.github_client = GitHubClient(config.get("github_token", ""))
-        self.claude_client = ClaudeClient(config.get("claude_api_key", ""))
+        self.claude_client = ClaudeClient(config.get("claude_api_key", ""), cache=self._response_cache())
+    
+    def _response_cache(self) -> ResponseCache:
+        """
+        Build the Claude response cache from the ai.response_cache settings.
+        
+        Returns:
+            A cache persisted to disk if the persistent option is set, otherwise an in-memory one
+        """
+        settings = self.config.get("ai", {}).get("response_cache", {})
+        if not settings.get("persistent"):
+            return ResponseCache()
+        
+        size_limit_mb = settings.get("size_limit_mb")
+        return ResponseCache(
+            Path(settings.get("directory", DEFAULT_CACHE_DIR)).expanduser(),
+            ttl_seconds=settings.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+            size_limit=size_limit_mb * 1024 * 1024 if size_limit_mb is not None else DEFAULT_SIZE_LIMIT
+        )
+    
+    def _work_dir_parent(self) -> Optional[str]:
+        """
+        Choose where to create the temporary working copy of a repository.
+        
+        Returns:
+            A RAM-backed directory if the in_memory_workdir option is set and one exists,
+            otherwise None for the system default
+        """
+        if not self.config.get("in_memory_workdir"):
+            return None
+        
+        # Cloning straight onto tmpfs keeps every later scan, read and test run off the disk
+        if os.path.isdir(_RAM_DISK) and os.access(_RAM_DISK, os.W_OK):
+            return _RAM_DISK
+        
+        logger.warning(f"in_memory_workdir is set but {_RAM_DISK} is not available; using the default temp directory")
+        return None
     
     async def process_request(self, repo_url: str, feature_description: str, target_branch: str = "main") -> str:
         """
@@ -48,7 +88,7 @@ class Orchestrator:
         logger.info(f"Processing request {task_id} for repo {repo_url}")
         
         # Create temporary directory for the repository
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(dir=self._work_dir_parent()) as temp_dir:
             repo_path = Path(temp_dir) / "repo"
             
             try:
@@ -62,7 +102,8 @@ class Orchestrator:
                 await git_ops.create_branch(branch_name)
                 
                 # 3. Analyze project structure
-                analyzer = ProjectAnalyzer(repo_path)
+                # The clone is a throwaway directory, so don't leave cached analyses of it behind
+                analyzer = ProjectAnalyzer(repo_path, cache_dir=None)
                 project_structure = await analyzer.analyze()
                 
                 # 4. Get AI to understand the task and generate a plan